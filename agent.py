@@ -7,6 +7,9 @@ The agent continuously negotiates and fulfills contracts to maximize profit.
 
 import os
 import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
@@ -15,7 +18,7 @@ from models.agent_data import AgentContext, AgentData, PerformanceMetrics
 from models.contract import Contract
 from models.ship import Ship
 from models.state_enums import AgentState
-from utils.logging import setup_logging
+from utils.logging import setup_logging, stop_logging
 from states.base_state import BaseState
 from states.assess_situation import AssessSituationState
 from states.negotiate_contract import NegotiateContractState
@@ -23,6 +26,29 @@ from states.accept_contract import AcceptContractState
 from states.acquire_resources import AcquireResourcesState
 
 
+@dataclass(frozen=True)
+class Config:
+    """Agent configuration read from the environment / .env file."""
+    api_base_url: str
+    agent_token: Optional[str]
+    account_token: Optional[str]
+    cache_path: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def _get_config() -> Config:
+    """Load the configuration once per process; later calls reuse it."""
+    load_dotenv()
+    
+    return Config(
+        api_base_url=os.getenv('SPACETRADERS_API_URL', 'https://api.spacetraders.io'),
+        agent_token=os.getenv('AGENT_TOKEN'),
+        account_token=os.getenv('ACCOUNT_TOKEN'),
+        # An empty value disables the on-disk cache
+        cache_path=os.getenv('SPACETRADERS_CACHE_PATH', '.spacetraders_cache.sqlite') or None,
+    )
+
+
 class SpaceTradersAgent:
     """
     Autonomous agent for SpaceTraders game that operates as a state machine.
@@ -39,7 +65,8 @@ class SpaceTradersAgent:
         # Initialize API client
         self.api_client = SpaceTradersAPIClient(
             base_url=self.api_base_url,
-            agent_token=self.agent_token
+            agent_token=self.agent_token,
+            cache_path=self.config.cache_path
         )
         
         # Initialize shared context
@@ -51,21 +78,37 @@ class SpaceTradersAgent:
         # State management
         self.current_state = AgentState.INITIALIZE
         self.running = True
+        self.poll_interval = 1.0  # Delay before re-running a state that did not transition
         
         # State registry - will be populated as we implement states
         self.state_registry = {}
         self._register_states()
         
+        # Legacy handlers for not-yet-migrated states, indexed by AgentState value
+        self._legacy_handlers = (
+            self.state_initialize,
+            self.state_assess_situation,
+            self.state_negotiate_contract,
+            self.state_accept_contract,
+            self.state_plan_fulfillment,
+            self.state_acquire_resources,
+            self.state_execute_contract,
+            self.state_deliver_goods,
+            self.state_complete_contract,
+            self.state_evaluate_performance,
+            self.state_error_recovery,
+        )
+        
         self.logger.info("SpaceTraders Agent initialized")
     
     
     def load_configuration(self) -> None:
-        """Load configuration from environment variables."""
-        load_dotenv()
+        """Load configuration from environment variables (parsed once per process)."""
+        self.config = _get_config()
         
-        self.api_base_url = os.getenv('SPACETRADERS_API_URL', 'https://api.spacetraders.io')
-        self.agent_token = os.getenv('AGENT_TOKEN')
-        self.account_token = os.getenv('ACCOUNT_TOKEN')
+        self.api_base_url = self.config.api_base_url
+        self.agent_token = self.config.agent_token
+        self.account_token = self.config.account_token
         
         if not self.agent_token and not self.account_token:
             raise ValueError("Either AGENT_TOKEN or ACCOUNT_TOKEN must be provided in .env file")
@@ -83,15 +126,18 @@ class SpaceTradersAgent:
         try:
             while self.running:
                 try:
-                    self.logger.debug(f"Executing state: {self.current_state.value}")
-                    next_state = self.execute_current_state()
+                    self.logger.debug(f"Executing state: {self.current_state.name}")
+                    previous_state = self.current_state
+                    next_state = self._gate_transition(self.execute_current_state())
+                    transitioned = next_state is not None and next_state != self.current_state
                     
-                    if next_state and next_state != self.current_state:
-                        self.logger.info(f"State transition: {self.current_state.value} -> {next_state.value}")
+                    if transitioned:
+                        self.logger.info(f"State transition: {self.current_state.name} -> {next_state.name}")
                         self.current_state = next_state
                     
-                    # Small delay to prevent excessive API calls
-                    time.sleep(1)
+                    delay = self._next_tick_delay(previous_state, transitioned)
+                    if delay > 0:
+                        self.context.sleep_until_woken(delay)
                     
                 except KeyboardInterrupt:
                     self.logger.info("Received shutdown signal")
@@ -107,6 +153,55 @@ class SpaceTradersAgent:
             self.context.performance_metrics.total_execution_time = execution_time
             self.logger.info(f"Agent stopped after {execution_time:.2f} seconds")
             self.context.log_performance_summary()
+            self.api_client.close()
+            stop_logging()
+    
+    def _gate_transition(self, next_state: Optional[AgentState]) -> Optional[AgentState]:
+        """
+        Redirect transitions into states that are backing off after a failure.
+        
+        Args:
+            next_state: State requested by the current state handler
+            
+        Returns:
+            Optional[AgentState]: State to actually transition to
+        """
+        if next_state == AgentState.ACQUIRE_RESOURCES:
+            retry_in = self.context.strategy_config.acquire_retry_remaining()
+            if retry_in:
+                self.logger.info(f"Resource acquisition backing off for {retry_in:.0f}s - negotiating instead")
+                return AgentState.NEGOTIATE_CONTRACT
+        return next_state
+    
+    def _next_tick_delay(self, previous_state: AgentState, transitioned: bool) -> float:
+        """
+        Work out how long to wait before the next state tick.
+        
+        A transition out of an implemented state runs the next state
+        immediately. Everything else is paced at `poll_interval`: a state
+        that stays put, a legacy stub handler (which does no I/O and would
+        otherwise spin through the stub cycle), and any cycle back to
+        ASSESS_SITUATION. A wait scheduled by a state or an active
+        Retry-After pause from the API client extends the delay.
+        
+        Args:
+            previous_state: State that ran during the last tick
+            transitioned: Whether the last tick moved to a different state
+            
+        Returns:
+            float: Seconds to sleep (0 to continue immediately)
+        """
+        immediate = (
+            transitioned
+            and previous_state in self.state_registry
+            and self.current_state != AgentState.ASSESS_SITUATION
+        )
+        delay = 0.0 if immediate else self.poll_interval
+        return max(
+            delay,
+            self.context.consume_scheduled_wait(),
+            self.api_client.rate_limiter.blocked_remaining(),
+        )
     
     def execute_current_state(self) -> Optional[AgentState]:
         """
@@ -115,6 +210,13 @@ class SpaceTradersAgent:
         Returns:
             Optional[AgentState]: Next state to transition to, or None to stay in current state
         """
+        # One clock sample for every expiry and deadline check made during this state
+        self.context.tick_now = datetime.now(timezone.utc)
+        # Assessment always reads fresh agent data; the states it leads into reuse
+        # that data until a write or AGENT_DATA_TTL invalidates it
+        if self.current_state == AgentState.ASSESS_SITUATION:
+            self.api_client.expire_agent_cache()
+        
         # Get state handler from registry or fallback to legacy methods
         state_handler = self.state_registry.get(self.current_state)
         
@@ -123,23 +225,8 @@ class SpaceTradersAgent:
             return state_handler.execute()
         else:
             # Fallback to legacy state methods for not-yet-migrated states
-            legacy_handlers = {
-                AgentState.INITIALIZE: self.state_initialize,
-                AgentState.ASSESS_SITUATION: self.state_assess_situation,
-                AgentState.NEGOTIATE_CONTRACT: self.state_negotiate_contract,
-                AgentState.ACCEPT_CONTRACT: self.state_accept_contract,
-                AgentState.PLAN_FULFILLMENT: self.state_plan_fulfillment,
-                AgentState.ACQUIRE_RESOURCES: self.state_acquire_resources,
-                AgentState.EXECUTE_CONTRACT: self.state_execute_contract,
-                AgentState.DELIVER_GOODS: self.state_deliver_goods,
-                AgentState.COMPLETE_CONTRACT: self.state_complete_contract,
-                AgentState.EVALUATE_PERFORMANCE: self.state_evaluate_performance,
-                AgentState.ERROR_RECOVERY: self.state_error_recovery,
-            }
-            
-            handler = legacy_handlers.get(self.current_state)
-            if handler:
-                return handler()
+            if 0 <= self.current_state < len(self._legacy_handlers):
+                return self._legacy_handlers[self.current_state]()
             else:
                 self.logger.error(f"No handler found for state: {self.current_state}")
                 return AgentState.ERROR_RECOVERY
@@ -382,6 +469,11 @@ class SpaceTradersAgent:
         """Gracefully shutdown the agent."""
         self.logger.info("Initiating graceful shutdown...")
         self.running = False
+        # Don't leave a delayed contract fetch to fire after the client is closed
+        if self.context.contract_prefetch is not None:
+            self.context.contract_prefetch[1].cancel()
+            self.context.contract_prefetch = None
+        self.context.wake()
     
     def _register_states(self) -> None:
         """Register implemented state classes."""
@@ -0,0 +1,153 @@
+"""
+Response caching for the SpaceTraders API client.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire after a per-entry time-to-live.
+    
+    When `maxsize` is reached the least recently used entry is evicted.
+    Cached values are shared between callers and must be treated as read-only.
+    An optional jitter stretches each TTL by a random fraction so entries
+    stored together don't all expire (and get refetched) at the same moment.
+    """
+    
+    def __init__(self, maxsize: int = 1024, jitter: float = 0.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries to keep
+            jitter: Extra random share of the TTL added to each entry, e.g. 0.25 for up to +25%
+        """
+        self.maxsize = maxsize
+        self.jitter = jitter
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store `value` under `key` for `ttl` seconds."""
+        self._store(key, value, self._expiry(ttl))
+    
+    def _expiry(self, ttl: float) -> float:
+        """Get the expiry time of an entry stored now for `ttl` seconds, with jitter applied."""
+        if self.jitter:
+            ttl += random.uniform(0, ttl * self.jitter)
+        return time.time() + ttl
+    
+    def _store(self, key: Hashable, value: Any, expires_at: float) -> None:
+        """Store `value` under `key` until `expires_at`, evicting the oldest entries if full."""
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def remove(self, key: Hashable) -> None:
+        """Drop the entry for `key` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCache(TTLCache):
+    """
+    TTLCache backed by a SQLite file so entries survive agent restarts.
+    
+    All rows are loaded into memory on startup, so lookups stay in-process;
+    every set/remove/clear is written through to disk. Expired rows are
+    pruned when the file is opened.
+    """
+    
+    def __init__(self, path: str, table: str = "responses", maxsize: int = 1024,
+                 persist: Optional[Callable[[str], bool]] = None, jitter: float = 0.0):
+        """
+        Initialize the cache and load persisted entries.
+        
+        Args:
+            path: SQLite database file
+            table: Table holding this cache's rows
+            maxsize: Maximum number of entries to keep in memory
+            persist: Optional predicate on the key; entries it rejects stay memory-only
+            jitter: Extra random share of the TTL added to each entry (see TTLCache)
+        """
+        super().__init__(maxsize=maxsize, jitter=jitter)
+        self.table = table
+        self.persist = persist
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._db.execute(f"DELETE FROM {table} WHERE expires_at <= ?", (time.time(),))
+        self._db.commit()
+        
+        rows = self._db.execute(
+            f"SELECT key, expires_at, value FROM {table} ORDER BY expires_at DESC LIMIT ?", (maxsize,)
+        ).fetchall()
+        for key, expires_at, value in reversed(rows):
+            self._entries[key] = (expires_at, json.loads(value))
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store `value` under `key` for `ttl` seconds, persisting it when allowed."""
+        # The same jittered expiry is used in memory and on disk
+        expires_at = self._expiry(ttl)
+        self._store(key, value, expires_at)
+        if self.persist is None or self.persist(key):
+            with self._lock:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(value)),
+                )
+                self._db.commit()
+    
+    def remove(self, key: str) -> None:
+        """Drop the entry for `key` from memory and disk."""
+        super().remove(key)
+        with self._lock:
+            self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._db.commit()
+    
+    def clear(self) -> None:
+        """Drop all entries from memory and disk."""
+        super().clear()
+        with self._lock:
+            self._db.execute(f"DELETE FROM {self.table}")
+            self._db.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
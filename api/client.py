@@ -3,13 +3,119 @@ SpaceTraders API client for making HTTP requests to the SpaceTraders API.
 """
 
 import os
-import time
+import json
 import logging
-from typing import Dict, Any, Optional, List
+import socket
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlencode
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.util.retry import Retry
 
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding when installed
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec  # Optional: native single-pass decoder, used when orjson is not installed
+except ImportError:
+    msgspec = None
+
+from .cache import SqliteCache, TTLCache
+from .rate_limiter import TokenBucket
+
+
+USER_AGENT = "spacetraders-agent/1.0"
+
+# System data is effectively static; market prices and shipyard stock change on a minutes scale
+SYSTEM_DATA_TTL = 3600
+MARKET_TTL = 60
+# Agent-owned state (/v2/my/...) is shared from one assessment until the next, and never for longer than this
+AGENT_DATA_TTL = 5
+# Extra random share of the TTL added to system and market entries so entries cached
+# together (e.g. every page of a system scan) don't all expire at once
+SYSTEM_CACHE_JITTER = 0.25
+# How long an ETag is kept for conditional revalidation after the entry expires
+ETAG_TTL = 24 * 3600
+
+# Longest Retry-After pause honoured; a larger value would stall every request through the client
+MAX_RETRY_AFTER = 300.0
+
+# Largest page size accepted by the list endpoints
+MAX_PAGE_LIMIT = 20
+
+# Per-ship endpoint paths, formatted with the ship symbol on each call
+_SHIP = "/v2/my/ships/%s"
+_SHIP_CARGO = "/v2/my/ships/%s/cargo"
+_SHIP_ORBIT = "/v2/my/ships/%s/orbit"
+_SHIP_DOCK = "/v2/my/ships/%s/dock"
+_SHIP_NAVIGATE = "/v2/my/ships/%s/navigate"
+_SHIP_REFUEL = "/v2/my/ships/%s/refuel"
+_SHIP_PURCHASE = "/v2/my/ships/%s/purchase"
+_SHIP_SELL = "/v2/my/ships/%s/sell"
+
+# Reusable decoder instance; building one per response would waste its setup cost
+_MSGSPEC_DECODER = msgspec.json.Decoder() if msgspec is not None else None
+
+# Concurrent requests for fan-outs; kept below the connection pool size so
+# every in-flight request gets its own warm keep-alive connection
+MAX_CONCURRENT_REQUESTS = 8
+
+
+class LowLatencyHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose sockets disable Nagle's algorithm and enable TCP keep-alive.
+    
+    API requests are small and latency-bound, so waiting to coalesce small
+    writes only adds delay; keep-alive probes detect dead pooled connections.
+    """
+    
+    # Keep urllib3's defaults, with TCP_NODELAY set exactly once
+    SOCKET_OPTIONS = [
+        option for option in HTTPConnection.default_socket_options
+        if option[:2] != (socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    ] + [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", self.SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _json_dumps(payload: Any) -> bytes:
+    """Serialize a request body to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(content: bytes) -> Any:
+    """Deserialize a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(content)
+    if _MSGSPEC_DECODER is not None:
+        return _MSGSPEC_DECODER.decode(content)
+    return json.loads(content)
+
+
+def _copy_future_outcome(target: Future, source: Future) -> None:
+    """Resolve `target` with the result or exception of the finished `source`."""
+    if source.cancelled():
+        target.set_exception(CancelledError())
+        return
+    exception = source.exception()
+    if exception is not None:
+        target.set_exception(exception)
+    else:
+        target.set_result(source.result())
+
 
 class SpaceTradersAPIClient:
     """
@@ -19,7 +125,8 @@ class SpaceTradersAPIClient:
     API endpoints needed by the agent.
     """
     
-    def __init__(self, base_url: str = "https://api.spacetraders.io", agent_token: Optional[str] = None, timeout: float = 30.0):
+    def __init__(self, base_url: str = "https://api.spacetraders.io", agent_token: Optional[str] = None, timeout: float = 30.0,
+                 cache_path: Optional[str] = None):
         """
         Initialize the API client.
         
@@ -27,31 +134,109 @@ class SpaceTradersAPIClient:
             base_url: Base URL for the SpaceTraders API
             agent_token: Agent authentication token
             timeout: Request timeout in seconds
+            cache_path: Optional SQLite file used to persist system data between runs
         """
         self.base_url = base_url.rstrip("/")
         self.agent_token = agent_token
         self.timeout = timeout
         self.logger = logging.getLogger(__name__)
         
-        # Setup session with retry strategy
+        # Setup a persistent session so keep-alive connections are reused across calls
         self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": USER_AGENT,
+        })
+        if agent_token:
+            self.session.headers["Authorization"] = f"Bearer {agent_token}"
+        # 429s are handled in _make_request so the rate limiter can adapt to them
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 503, 504],
+            respect_retry_after_header=True,
+        )
+        adapter = LowLatencyHTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            pool_block=False,
+            max_retries=retry_strategy,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.5  # 500ms between requests
+        # Rate limiting (shared by all threads issuing requests through this client)
+        self.rate_limiter = TokenBucket(capacity=2, refill_rate=2.0)
+        self.max_rate_limit_retries = 3
+        
+        # Cache for idempotent GETs on rarely changing endpoints, plus the ETag and
+        # last body per cacheable request used to revalidate expired entries
+        if cache_path:
+            self.cache = SqliteCache(cache_path, table="responses", persist=self._is_persistent_key,
+                                     jitter=SYSTEM_CACHE_JITTER)
+            self.etag_cache = SqliteCache(cache_path, table="etags", persist=self._is_persistent_key)
+        else:
+            self.cache = TTLCache(maxsize=1024, jitter=SYSTEM_CACHE_JITTER)
+            self.etag_cache = TTLCache(maxsize=1024)
+        # Agent-owned responses are kept apart (and never persisted) so any write can drop
+        # them all; the agent loop also expires them before each assessment (see expire_agent_cache)
+        self.agent_cache = TTLCache(maxsize=64)
+        # Bumped by every write; lets callers tell whether data fetched earlier may be stale
+        self.write_generation = 0
+        self._agent_cache_epoch = 0
+        self._inflight: Dict[Tuple[str, Tuple[int, int]], Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Long-lived workers for concurrent fan-outs (see gather), plus the timers of
+        # delayed submissions that have not started yet
+        self._worker_state = threading.local()
+        self._scheduled: Dict[Future, threading.Timer] = {}
+        self._scheduled_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_REQUESTS,
+            thread_name_prefix="spacetraders-api",
+            initializer=self._mark_worker_thread,
+        )
+    
+    def _mark_worker_thread(self) -> None:
+        """Flag executor threads so nested gather() calls run inline."""
+        self._worker_state.is_worker = True
+    
+    @staticmethod
+    def _cache_key(method: str, endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build the cache key for a request (a plain string so it can be persisted)."""
+        key = f"{method} {endpoint}"
+        if params:
+            key += "?" + urlencode(sorted(params.items()))
+        return key
+    
+    @staticmethod
+    def _is_persistent_key(cache_key: str) -> bool:
+        """Only agent-independent system data is written to the on-disk cache."""
+        return cache_key.startswith("GET /v2/systems/")
+    
+    @staticmethod
+    def _cache_ttl(method: str, endpoint: str) -> Optional[float]:
+        """Return how long a response may be cached, or None if it must not be."""
+        if method != "GET":
+            return None
+        if endpoint.startswith("/v2/my/"):
+            return AGENT_DATA_TTL
+        if not endpoint.startswith("/v2/systems/"):
+            return None
+        if endpoint.endswith(("/market", "/shipyard")):
+            return MARKET_TTL
+        return SYSTEM_DATA_TTL
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
         Make a request to the API with proper error handling and rate limiting.
         
+        Cacheable GETs are served from the cache when fresh, and concurrent
+        identical cacheable GETs share a single in-flight HTTP call. Any other
+        request may change agent state, so it drops the cached agent data.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
@@ -64,33 +249,153 @@ class SpaceTradersAPIClient:
             requests.HTTPError: For HTTP errors
             requests.RequestException: For other request errors
         """
-        # Rate limiting
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
+        cache_ttl = self._cache_ttl(method, endpoint)
+        if cache_ttl is None:
+            try:
+                return _json_loads(self._send_request(method, endpoint, **kwargs).content)
+            finally:
+                # Even a failed write may have been applied server-side
+                if method != "GET":
+                    self.write_generation += 1
+                    self.agent_cache.clear()
         
-        url = f"{self.base_url}{endpoint}"
-        headers = kwargs.pop("headers", {})
+        agent_owned = endpoint.startswith("/v2/my/")
+        cache = self.agent_cache if agent_owned else self.cache
+        cache_key = self._cache_key(method, endpoint, kwargs.get("params"))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug("Cache hit for %s %s", method, endpoint)
+            return cached
         
-        if self.agent_token:
-            headers["Authorization"] = f"Bearer {self.agent_token}"
-        headers.setdefault("Content-Type", "application/json")
+        # A write (or, for agent data, a new assessment) that happens while this GET
+        # is in flight may have changed the resource, so a body fetched across one
+        # is returned but not cached, and later requests never join it
+        generation = self._cache_generation(agent_owned)
+        inflight_key = (cache_key, generation)
         
-        self.logger.debug(f"Making {method} request to {url}")
+        # Single-flight: join an identical request that is already in progress
+        with self._inflight_lock:
+            inflight = self._inflight.get(inflight_key)
+            if inflight is None:
+                future = Future()
+                self._inflight[inflight_key] = future
+        
+        if inflight is not None:
+            self.logger.debug("Joining in-flight request for %s %s", method, endpoint)
+            return inflight.result()
         
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=self.timeout,
-                **kwargs
-            )
-            self.last_request_time = time.time()
+            data = self._revalidate_request(cache_key, method, endpoint, **kwargs)
+            if generation == self._cache_generation(agent_owned):
+                cache.set(cache_key, data, cache_ttl)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[inflight_key]
+    
+    def _cache_generation(self, agent_owned: bool) -> Tuple[int, int]:
+        """Token that changes whenever cached data of this kind may have gone stale."""
+        return self.write_generation, self._agent_cache_epoch if agent_owned else 0
+    
+    def expire_agent_cache(self) -> None:
+        """
+        Drop cached agent data so the next reads go to the API.
+        
+        Called by the agent loop before every ASSESS_SITUATION tick: agent,
+        ship and contract data change server-side without writes from this
+        client, so assessment always reads it fresh. The states that follow
+        (e.g. NEGOTIATE_CONTRACT listing contracts right after assessment)
+        reuse what it fetched.
+        """
+        self._agent_cache_epoch += 1
+        self.agent_cache.clear()
+    
+    def _revalidate_request(self, cache_key: str, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """
+        Fetch a cacheable resource, sending If-None-Match when an ETag is known.
+        
+        A 304 Not Modified answer reuses the previously stored body without
+        downloading or decoding it again.
+        """
+        known = self.etag_cache.get(cache_key)
+        if known is not None:
+            etag, body = known
+            headers = kwargs.pop("headers", {})
+            headers["If-None-Match"] = etag
+            kwargs["headers"] = headers
+        
+        response = self._send_request(method, endpoint, **kwargs)
+        
+        if response.status_code == 304 and known is not None:
+            self.logger.debug("Not modified: %s %s", method, endpoint)
+            return body
+        
+        data = _json_loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            self.etag_cache.set(cache_key, (etag, data), ETAG_TTL)
+        return data
+    
+    def _send_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send a request over the session, waiting for rate-limit tokens and
+        retrying when the server answers 429 Too Many Requests.
+        
+        Writes are not retried on other errors (urllib3 only retries GETs):
+        the API does not deduplicate them, so repeating one that was applied
+        before a gateway error could trade twice, or report an accept or
+        navigate that succeeded as "already accepted" / "in transit".
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            **kwargs: Additional arguments for requests
             
-            response.raise_for_status()
-            return response.json()
+        Returns:
+            requests.Response: The successful (or 304 Not Modified) response
+        """
+        url = f"{self.base_url}{endpoint}"
+        
+        # Serialize the body ourselves; Content-Type is already set on the session
+        if "json" in kwargs:
+            kwargs["data"] = _json_dumps(kwargs.pop("json"))
+        
+        self.logger.debug("Making %s request to %s", method, url)
+        
+        try:
+            for attempt in range(self.max_rate_limit_retries + 1):
+                # Rate limiting - wait for a token from the shared bucket
+                self.rate_limiter.acquire()
+                
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    timeout=self.timeout,
+                    **kwargs
+                )
+                
+                throttled = response.status_code == 429
+                self.rate_limiter.record(throttled)
+                
+                if throttled and attempt < self.max_rate_limit_retries:
+                    retry_after = TokenBucket.parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is None:
+                        retry_after = TokenBucket.backoff_delay(attempt)
+                    retry_after = min(retry_after, MAX_RETRY_AFTER)
+                    self.logger.warning(f"Rate limited on {method} {endpoint}, retrying in {retry_after:.2f}s")
+                    self.rate_limiter.penalize(retry_after)
+                    continue
+                
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Response %s for %s %s (%d bytes)",
+                                      response.status_code, method, endpoint, len(response.content))
+                
+                response.raise_for_status()
+                return response
             
         except requests.exceptions.HTTPError as e:
             self.logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
@@ -99,6 +404,132 @@ class SpaceTradersAPIClient:
             self.logger.error(f"Request error: {e}")
             raise
     
+    def gather(self, *calls: Callable[[], Any]) -> List[Any]:
+        """
+        Run independent API calls concurrently over the shared connection pool.
+        
+        Args:
+            *calls: Zero-argument callables, typically bound client methods or lambdas
+            
+        Returns:
+            List of results in the same order as the calls
+            
+        Raises:
+            Exception: The first exception raised by any of the calls
+        """
+        # Called from a worker (e.g. paging inside a gathered call): run inline so
+        # workers never block waiting on tasks queued behind them
+        if getattr(self._worker_state, "is_worker", False):
+            return [call() for call in calls]
+        
+        futures = [self._executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+    
+    def submit(self, call: Callable[[], Any], delay: float = 0.0) -> Future:
+        """
+        Start an API call in the background on the shared workers.
+        
+        Args:
+            call: Zero-argument callable, typically a bound client method
+            delay: Seconds to wait before handing the call to a worker. The
+                returned future can be cancelled until then, and close()
+                cancels every call still waiting
+            
+        Returns:
+            Future resolving to the call's result
+        """
+        if delay <= 0:
+            return self._executor.submit(call)
+        
+        future: Future = Future()
+        
+        def start() -> None:
+            with self._scheduled_lock:
+                self._scheduled.pop(future, None)
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = self._executor.submit(call)
+            except RuntimeError as e:  # Executor shut down by close()
+                future.set_exception(e)
+                return
+            result.add_done_callback(partial(_copy_future_outcome, future))
+        
+        timer = threading.Timer(delay, start)
+        timer.daemon = True
+        with self._scheduled_lock:
+            self._scheduled[future] = timer
+        timer.start()
+        return future
+    
+    def _list_all(self, fetch_page: Callable[..., Dict[str, Any]], limit: int) -> Dict[str, Any]:
+        """
+        Fetch every page of a paginated endpoint.
+        
+        Page 1 is fetched first to learn `meta.total`; the remaining pages are
+        then requested concurrently.
+        
+        Args:
+            fetch_page: Client method taking `page` and `limit` keyword arguments
+            limit: Page size
+            
+        Returns:
+            Dict shaped like a single-page response, with all items under 'data'
+        """
+        items = []
+        for page_items in self._iter_pages(fetch_page, limit):
+            items.extend(page_items)
+        
+        return {'data': items, 'meta': {'total': len(items), 'page': 1, 'limit': limit}}
+    
+    def _iter_pages(self, fetch_page: Callable[..., Dict[str, Any]], limit: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the items of each page of a paginated endpoint in page order.
+        
+        Page 1 is yielded as soon as it arrives; the remaining pages are then
+        requested concurrently and each is released once it has been yielded.
+        
+        Args:
+            fetch_page: Client method taking `page` and `limit` keyword arguments
+            limit: Page size
+            
+        Yields:
+            The 'data' list of each page
+        """
+        first_page = fetch_page(page=1, limit=limit)
+        page_items = first_page.get('data', [])
+        total = first_page.get('meta', {}).get('total', len(page_items))
+        yield page_items
+        
+        total_pages = -(-total // limit)
+        if total_pages > 1:
+            responses = self.gather(*[
+                partial(fetch_page, page=page, limit=limit)
+                for page in range(2, total_pages + 1)
+            ])
+            responses.reverse()
+            while responses:
+                yield responses.pop().get('data', [])
+    
+    def close(self) -> None:
+        """Cancel delayed calls, close the underlying session and release pooled connections."""
+        with self._scheduled_lock:
+            scheduled, self._scheduled = self._scheduled, {}
+        for future, timer in scheduled.items():
+            timer.cancel()
+            future.cancel()
+        self._executor.shutdown(wait=False)
+        self.session.close()
+        for cache in (self.cache, self.etag_cache):
+            if isinstance(cache, SqliteCache):
+                cache.close()
+    
+    def __enter__(self) -> 'SpaceTradersAPIClient':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     # Agent endpoints
     
     def get_my_agent(self) -> Dict[str, Any]:
@@ -112,11 +543,15 @@ class SpaceTradersAPIClient:
     
     # Contract endpoints
     
-    def get_my_contracts(self, page: int = 1, limit: int = 10) -> Dict[str, Any]:
+    def get_my_contracts(self, page: int = 1, limit: int = MAX_PAGE_LIMIT) -> Dict[str, Any]:
         """Get the agent's contracts."""
         params = {"page": page, "limit": limit}
         return self._make_request("GET", "/v2/my/contracts", params=params)
     
+    def list_all_contracts(self, limit: int = MAX_PAGE_LIMIT) -> Dict[str, Any]:
+        """Get all of the agent's contracts across every page."""
+        return self._list_all(self.get_my_contracts, limit)
+    
     def get_contract(self, contract_id: str) -> Dict[str, Any]:
         """Get a specific contract by ID."""
         return self._make_request("GET", f"/v2/my/contracts/{contract_id}")
@@ -140,31 +575,35 @@ class SpaceTradersAPIClient:
     
     # Ship endpoints
     
-    def get_my_ships(self, page: int = 1, limit: int = 10) -> Dict[str, Any]:
+    def get_my_ships(self, page: int = 1, limit: int = MAX_PAGE_LIMIT) -> Dict[str, Any]:
         """Get the agent's ships."""
         params = {"page": page, "limit": limit}
         return self._make_request("GET", "/v2/my/ships", params=params)
     
+    def list_all_ships(self, limit: int = MAX_PAGE_LIMIT) -> Dict[str, Any]:
+        """Get all of the agent's ships across every page."""
+        return self._list_all(self.get_my_ships, limit)
+    
     def get_ship(self, ship_symbol: str) -> Dict[str, Any]:
         """Get a specific ship by symbol."""
-        return self._make_request("GET", f"/v2/my/ships/{ship_symbol}")
+        return self._make_request("GET", _SHIP % ship_symbol)
     
     def get_ship_cargo(self, ship_symbol: str) -> Dict[str, Any]:
         """Get a ship's cargo."""
-        return self._make_request("GET", f"/v2/my/ships/{ship_symbol}/cargo")
+        return self._make_request("GET", _SHIP_CARGO % ship_symbol)
     
     def orbit_ship(self, ship_symbol: str) -> Dict[str, Any]:
         """Put a ship in orbit."""
-        return self._make_request("POST", f"/v2/my/ships/{ship_symbol}/orbit")
+        return self._make_request("POST", _SHIP_ORBIT % ship_symbol)
     
     def dock_ship(self, ship_symbol: str) -> Dict[str, Any]:
         """Dock a ship."""
-        return self._make_request("POST", f"/v2/my/ships/{ship_symbol}/dock")
+        return self._make_request("POST", _SHIP_DOCK % ship_symbol)
     
     def navigate_ship(self, ship_symbol: str, waypoint_symbol: str) -> Dict[str, Any]:
         """Navigate a ship to a waypoint."""
         data = {"waypointSymbol": waypoint_symbol}
-        return self._make_request("POST", f"/v2/my/ships/{ship_symbol}/navigate", json=data)
+        return self._make_request("POST", _SHIP_NAVIGATE % ship_symbol, json=data)
     
     def refuel_ship(self, ship_symbol: str, units: Optional[int] = None, from_cargo: bool = False) -> Dict[str, Any]:
         """Refuel a ship."""
@@ -173,22 +612,28 @@ class SpaceTradersAPIClient:
             data["units"] = units
         if from_cargo:
             data["fromCargo"] = from_cargo
-        return self._make_request("POST", f"/v2/my/ships/{ship_symbol}/refuel", json=data)
+        return self._make_request("POST", _SHIP_REFUEL % ship_symbol, json=data)
     
     def purchase_cargo(self, ship_symbol: str, trade_symbol: str, units: int) -> Dict[str, Any]:
         """Purchase cargo for a ship."""
         data = {"symbol": trade_symbol, "units": units}
-        return self._make_request("POST", f"/v2/my/ships/{ship_symbol}/purchase", json=data)
+        response = self._make_request("POST", _SHIP_PURCHASE % ship_symbol, json=data)
+        self._invalidate_market(response)
+        return response
     
     def sell_cargo(self, ship_symbol: str, trade_symbol: str, units: int) -> Dict[str, Any]:
         """Sell cargo from a ship."""
         data = {"symbol": trade_symbol, "units": units}
-        return self._make_request("POST", f"/v2/my/ships/{ship_symbol}/sell", json=data)
+        response = self._make_request("POST", _SHIP_SELL % ship_symbol, json=data)
+        self._invalidate_market(response)
+        return response
     
     def purchase_ship(self, ship_type: str, waypoint_symbol: str) -> Dict[str, Any]:
         """Purchase a ship at a shipyard."""
         data = {"shipType": ship_type, "waypointSymbol": waypoint_symbol}
-        return self._make_request("POST", "/v2/my/ships", json=data)
+        response = self._make_request("POST", "/v2/my/ships", json=data)
+        self._invalidate_shipyard(waypoint_symbol)
+        return response
     
     # System and waypoint endpoints
     
@@ -201,6 +646,10 @@ class SpaceTradersAPIClient:
         params = {"page": page, "limit": limit}
         return self._make_request("GET", f"/v2/systems/{system_symbol}/waypoints", params=params)
     
+    def iter_system_waypoint_pages(self, system_symbol: str, limit: int = MAX_PAGE_LIMIT) -> Iterator[List[Dict[str, Any]]]:
+        """Yield a system's waypoints one page at a time, without collecting them into one list."""
+        return self._iter_pages(partial(self.get_system_waypoints, system_symbol), limit)
+    
     def get_waypoint(self, system_symbol: str, waypoint_symbol: str) -> Dict[str, Any]:
         """Get waypoint information."""
         return self._make_request("GET", f"/v2/systems/{system_symbol}/waypoints/{waypoint_symbol}")
@@ -215,7 +664,24 @@ class SpaceTradersAPIClient:
     
     # Utility methods
     
+    def _invalidate_market(self, trade_response: Dict[str, Any]) -> None:
+        """Drop the cached market of the waypoint a purchase/sell happened at."""
+        transaction = trade_response.get('data', {}).get('transaction', {})
+        waypoint_symbol = transaction.get('waypointSymbol')
+        if waypoint_symbol:
+            system_symbol = self.extract_system_from_waypoint(waypoint_symbol)
+            endpoint = f"/v2/systems/{system_symbol}/waypoints/{waypoint_symbol}/market"
+            self.cache.remove(self._cache_key("GET", endpoint, None))
+    
+    def _invalidate_shipyard(self, waypoint_symbol: str) -> None:
+        """Drop the cached shipyard of the waypoint a ship was bought at."""
+        system_symbol = self.extract_system_from_waypoint(waypoint_symbol)
+        endpoint = f"/v2/systems/{system_symbol}/waypoints/{waypoint_symbol}/shipyard"
+        self.cache.remove(self._cache_key("GET", endpoint, None))
+    
     def extract_system_from_waypoint(self, waypoint_symbol: str) -> str:
         """Extract system symbol from waypoint symbol (e.g., 'X1-DF55-20250Z' -> 'X1-DF55')."""
-        parts = waypoint_symbol.split('-')
-        return f"{parts[0]}-{parts[1]}" if len(parts) >= 2 else waypoint_symbol
\ No newline at end of file
+        # Slice up to the second '-' without building a list of all the parts
+        first = waypoint_symbol.find('-')
+        second = waypoint_symbol.find('-', first + 1) if first != -1 else -1
+        return waypoint_symbol[:second] if second != -1 else waypoint_symbol
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Client-side rate limiting for the SpaceTraders API.
+"""
+
+import math
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with adaptive refill rate.
+    
+    Each request consumes one token. Tokens refill continuously at
+    `refill_rate` per second up to `capacity`, which allows short bursts
+    while keeping the sustained rate under the server quota.
+    
+    The bucket also tracks an exponentially-weighted moving average of
+    throttled (429) responses. A 429 received while that average is above
+    `target_429_rate` halves the refill rate; once the average drops back
+    under the target, successful responses recover it slowly towards the
+    configured rate.
+    """
+    
+    def __init__(self, capacity: int = 2, refill_rate: float = 2.0, target_429_rate: float = 0.05,
+                 min_refill_rate: float = 0.25, ewma_alpha: float = 0.2):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            capacity: Maximum number of tokens (burst size)
+            refill_rate: Tokens added per second under normal conditions
+            target_429_rate: Acceptable share of throttled responses before slowing down
+            min_refill_rate: Lower bound for the adaptive refill rate
+            ewma_alpha: Smoothing factor for the throttled-response average
+        """
+        self.capacity = capacity
+        self.base_refill_rate = refill_rate
+        self.refill_rate = refill_rate
+        self.target_429_rate = target_429_rate
+        self.min_refill_rate = min_refill_rate
+        self.ewma_alpha = ewma_alpha
+        
+        self.tokens = float(capacity)
+        self.p_429 = 0.0
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last refill (lock must be held)."""
+        start = max(self._last_refill, self._blocked_until)
+        if now > start:
+            self.tokens = min(self.capacity, self.tokens + (now - start) * self.refill_rate)
+        self._last_refill = max(now, self._last_refill)
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                
+                if now >= self._blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                if now < self._blocked_until:
+                    wait_time = self._blocked_until - now
+                else:
+                    wait_time = (1 - self.tokens) / self.refill_rate
+            
+            time.sleep(wait_time)
+    
+    def penalize(self, delay: float) -> None:
+        """
+        Drain the bucket and pause refilling for `delay` seconds.
+        
+        Args:
+            delay: Seconds to wait before any further request is allowed
+        """
+        with self._lock:
+            self.tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+    
+    def blocked_remaining(self) -> float:
+        """Seconds left before the bucket accepts requests again after a penalty."""
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+    
+    def record(self, throttled: bool) -> None:
+        """
+        Record the outcome of a request and adapt the refill rate.
+        
+        Args:
+            throttled: True if the server answered with 429 Too Many Requests
+        """
+        with self._lock:
+            self.p_429 = (1 - self.ewma_alpha) * self.p_429 + self.ewma_alpha * (1.0 if throttled else 0.0)
+            
+            if throttled and self.p_429 > self.target_429_rate:
+                # Congestion detected - back off multiplicatively
+                self.refill_rate = max(self.min_refill_rate, self.refill_rate * 0.5)
+            elif not throttled and self.p_429 <= self.target_429_rate and self.refill_rate < self.base_refill_rate:
+                # Recover additively towards the configured rate
+                self.refill_rate = min(self.base_refill_rate, self.refill_rate + 0.1)
+    
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header given either in seconds or as an HTTP date.
+        
+        Returns:
+            Optional[float]: Seconds to wait, or None if the header is missing, invalid
+                or not finite (e.g. "inf" or "1e400")
+        """
+        if not value:
+            return None
+        
+        try:
+            seconds = float(value)
+        except ValueError:
+            pass
+        else:
+            return max(0.0, seconds) if math.isfinite(seconds) else None
+        
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    @staticmethod
+    def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+        """Exponential backoff with full jitter, used when no Retry-After is given."""
+        return min(cap, base * 2 ** attempt) * random.random()
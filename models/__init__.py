@@ -2,9 +2,9 @@
 Data models for SpaceTraders agent.
 """
 
-from .agent_data import AgentContext, AgentData
+from .agent_data import AgentContext, AgentData, StrategyConfig
 from .contract import Contract, ContractDelivery
 from .ship import Ship, ShipCargo
 from .state_enums import AgentState
 
-__all__ = ['AgentContext', 'AgentData', 'Contract', 'ContractDelivery', 'Ship', 'ShipCargo', 'AgentState']
\ No newline at end of file
+__all__ = ['AgentContext', 'AgentData', 'StrategyConfig', 'Contract', 'ContractDelivery', 'Ship', 'ShipCargo', 'AgentState']
\ No newline at end of file
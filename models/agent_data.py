@@ -3,14 +3,17 @@ Data models for agent information and shared context.
 """
 
 import logging
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timezone
 
 from api.client import SpaceTradersAPIClient
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentData:
     """Data model for agent information."""
     account_id: str
@@ -33,7 +36,7 @@ class AgentData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance tracking metrics for the agent."""
     contracts_completed: int = 0
@@ -61,6 +64,53 @@ class PerformanceMetrics:
         self.average_contract_completion_time = total_time / self.contracts_completed
 
 
+@dataclass(slots=True)
+class StrategyConfig:
+    """Strategy settings and the adaptive state the states record between ticks."""
+    min_profit_margin: float = 0.1  # 10% minimum profit margin
+    max_contract_duration: int = 3600  # 1 hour max contract duration
+    safety_credit_reserve: int = 10000  # Keep 10k credits in reserve
+    max_ships: int = 5  # Maximum number of ships to own
+    preferred_contract_types: Tuple[str, ...] = ('PROCUREMENT', 'TRANSPORT')
+    risk_tolerance: str = 'MEDIUM'
+    successful_contract_types: List[str] = field(default_factory=list)
+    acquire_retry_after_ts: float = 0.0  # Wall-clock time before which ACQUIRE_RESOURCES is not re-entered
+    
+    def acquire_retry_remaining(self) -> float:
+        """Get the seconds left before ACQUIRE_RESOURCES may be retried after a failure (0 if it may)."""
+        return max(0.0, self.acquire_retry_after_ts - time.time())
+
+
+@dataclass(slots=True)
+class FleetSnapshot:
+    """Fleet aggregates and partitions computed in one pass over the ships at refresh time."""
+    total_cargo_capacity: int = 0
+    largest_cargo_capacity: int = 0
+    available_cargo_space: int = 0
+    ships_needing_fuel: List['Ship'] = field(default_factory=list)  # Includes ships in transit
+    ships_in_transit: List['Ship'] = field(default_factory=list)
+    stationary_needing_fuel: List['Ship'] = field(default_factory=list)  # Not in transit and low on fuel
+    ready_ships: List['Ship'] = field(default_factory=list)  # Not in transit and fueled
+    
+    def add(self, ship: 'Ship') -> None:
+        """Fold one ship into the aggregates."""
+        cargo = ship.cargo
+        self.total_cargo_capacity += cargo.capacity
+        if cargo.capacity > self.largest_cargo_capacity:
+            self.largest_cargo_capacity = cargo.capacity
+        self.available_cargo_space += cargo.capacity - cargo.units
+        
+        needs_refuel = ship.fuel.needs_refuel
+        if needs_refuel:
+            self.ships_needing_fuel.append(ship)
+        if ship.nav.is_in_transit:
+            self.ships_in_transit.append(ship)
+        elif needs_refuel:
+            self.stationary_needing_fuel.append(ship)
+        else:
+            self.ready_ships.append(ship)
+
+
 @dataclass
 class AgentContext:
     """
@@ -74,51 +124,156 @@ class AgentContext:
     current_contract: Optional['Contract'] = None
     ships: List['Ship'] = field(default_factory=list)
     performance_metrics: PerformanceMetrics = field(default_factory=PerformanceMetrics)
-    strategy_config: Dict[str, Any] = field(default_factory=dict)
+    strategy_config: StrategyConfig = field(default_factory=StrategyConfig)
+    wait_until: float = 0.0  # Wall-clock time before which the main loop should not tick again
+    wake_event: threading.Event = field(default_factory=threading.Event, repr=False)  # Cuts that wait short
+    tick_now: Optional[datetime] = None  # Clock sample shared by everything evaluated in the current tick
+    # (client write generation, future) of a contract list fetched ahead of the next negotiation
+    contract_prefetch: Optional[Tuple[int, Future]] = field(default=None, repr=False)
+    hq_system_symbol: Optional[str] = None  # System of agent_data.headquarters, recomputed when it changes
+    # Fleet indexes and aggregates, rebuilt whenever the ship list is replaced or extended
+    ships_by_symbol: Dict[str, 'Ship'] = field(default_factory=dict, init=False, repr=False)
+    ships_by_waypoint: Dict[str, List['Ship']] = field(default_factory=dict, init=False, repr=False)
+    fleet_snapshot: FleetSnapshot = field(default_factory=FleetSnapshot, init=False, repr=False)
     
     def __post_init__(self):
-        """Initialize default strategy configuration."""
-        if not self.strategy_config:
-            self.strategy_config = {
-                'min_profit_margin': 0.1,  # 10% minimum profit margin
-                'max_contract_duration': 3600,  # 1 hour max contract duration
-                'safety_credit_reserve': 10000,  # Keep 10k credits in reserve
-                'max_ships': 5,  # Maximum number of ships to own
-                'preferred_contract_types': ['PROCUREMENT', 'TRANSPORT'],
-                'risk_tolerance': 'MEDIUM'
-            }
+        """Initialize fleet aggregates."""
+        self._reindex_fleet()
+    
+    def now(self) -> datetime:
+        """Get the current tick's time, or the live clock outside a tick."""
+        return self.tick_now or datetime.now(timezone.utc)
+    
+    def schedule_wait(self, seconds: float) -> None:
+        """Ask the main loop to wait at least `seconds` before the next state tick."""
+        self.wait_until = max(self.wait_until, time.time() + seconds)
+    
+    def consume_scheduled_wait(self) -> float:
+        """Return the remaining scheduled wait in seconds and clear it."""
+        remaining = max(0.0, self.wait_until - time.time())
+        self.wait_until = 0.0
+        return remaining
+    
+    def wake(self) -> None:
+        """Wake the main loop early, e.g. when something a state is waiting on has changed."""
+        self.wake_event.set()
+    
+    def sleep_until_woken(self, seconds: float) -> bool:
+        """
+        Block for up to `seconds`, returning early if `wake` is called.
+        
+        Returns:
+            bool: True if woken before the timeout
+        """
+        woken = self.wake_event.wait(seconds)
+        self.wake_event.clear()
+        return woken
     
     def update_agent_data(self, api_response: Dict[str, Any]) -> None:
         """Update agent data from API response."""
         if 'data' in api_response:
-            self.agent_data = AgentData.from_api_response(api_response['data'])
+            self.set_agent_data_from_payload(api_response['data'])
+    
+    def set_agent_data_from_payload(self, agent_payload: Dict[str, Any]) -> None:
+        """Update agent data from an agent object already taken out of its response envelope."""
+        previous = self.agent_data
+        self.agent_data = AgentData.from_api_response(agent_payload)
+        
+        headquarters = self.agent_data.headquarters
+        if previous is None or previous.headquarters != headquarters or self.hq_system_symbol is None:
+            self.hq_system_symbol = self.api_client.extract_system_from_waypoint(headquarters)
+    
+    def update_ships(self, ships_data: List[Dict[str, Any]]) -> None:
+        """
+        Replace the fleet with the ships in an API response.
+        
+        Ships already known by symbol are updated in place, so references held
+        elsewhere stay current; only newly reported ships are constructed.
+        """
+        known = dict(self.ships_by_symbol)  # A copy, so a failed update leaves the index intact
+        ships = []
+        for ship_data in ships_data:
+            ship = known.pop(ship_data.get('symbol', ''), None)
+            if ship is None:
+                ship = Ship.from_api_response(ship_data)
+            else:
+                ship.update_from_api_response(ship_data)
+            ships.append(ship)
+        
+        self.ships = ships
+        self._reindex_fleet()
+    
+    def add_ship(self, ship: 'Ship') -> None:
+        """Add a newly acquired ship to the fleet."""
+        self.ships.append(ship)
+        self.ships_by_symbol[ship.symbol] = ship
+        self.ships_by_waypoint.setdefault(ship.nav.waypoint_symbol, []).append(ship)
+        self.fleet_snapshot.add(ship)
+    
+    def _reindex_fleet(self) -> None:
+        """
+        Rebuild the fleet indexes and aggregates from the current ship list.
+        
+        Waypoint positions reflect the last refresh; ships that start
+        navigating keep their old entry until the fleet is refreshed again.
+        """
+        by_symbol = {}
+        by_waypoint = {}
+        snapshot = FleetSnapshot()
+        for ship in self.ships:
+            by_symbol[ship.symbol] = ship
+            by_waypoint.setdefault(ship.nav.waypoint_symbol, []).append(ship)
+            snapshot.add(ship)
+        self.ships_by_symbol = by_symbol
+        self.ships_by_waypoint = by_waypoint
+        self.fleet_snapshot = snapshot
     
     def has_sufficient_credits(self, amount: int) -> bool:
         """Check if agent has sufficient credits for an operation."""
+        spendable = self.spendable_credits()
+        return spendable is not None and spendable >= amount
+    
+    def spendable_credits(self) -> Optional[int]:
+        """Get the credits available above the safety reserve, or None without agent data."""
         if not self.agent_data:
-            return False
-        available = self.agent_data.credits - self.strategy_config['safety_credit_reserve']
-        return available >= amount
+            return None
+        return self.agent_data.credits - self.strategy_config.safety_credit_reserve
+    
+    @property
+    def total_cargo_capacity(self) -> int:
+        """Total cargo capacity across all ships, kept current by every fleet update."""
+        return self.fleet_snapshot.total_cargo_capacity
     
     def get_total_cargo_capacity(self) -> int:
-        """Get total cargo capacity across all ships."""
-        return sum(ship.cargo_capacity for ship in self.ships)
+        """Get total cargo capacity across all ships (same as `total_cargo_capacity`)."""
+        return self.total_cargo_capacity
     
     def get_available_cargo_space(self) -> int:
         """Get available cargo space across all ships."""
-        return sum(ship.get_available_cargo_space() for ship in self.ships)
+        # Capacity is cached; held units change as cargo is bought and sold
+        used = 0
+        for ship in self.ships:
+            used += ship.cargo.units
+        return self.total_cargo_capacity - used
     
     def log_performance_summary(self) -> None:
         """Log current performance metrics."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         metrics = self.performance_metrics
-        self.logger.info("=== PERFORMANCE SUMMARY ===")
-        self.logger.info(f"Contracts completed: {metrics.contracts_completed}")
-        self.logger.info(f"Contracts failed: {metrics.contracts_failed}")
-        self.logger.info(f"Total credits earned: {metrics.total_credits_earned}")
-        self.logger.info(f"Current credits: {self.agent_data.credits if self.agent_data else 0}")
-        self.logger.info(f"Last contract profit: {metrics.last_contract_profit}")
-        self.logger.info(f"Efficiency: {metrics.calculate_efficiency():.2f} contracts/hour")
-        self.logger.info(f"Errors encountered: {metrics.errors_encountered}")
+        # One record for the whole block instead of one handler dispatch per line
+        lines = [
+            "=== PERFORMANCE SUMMARY ===",
+            f"Contracts completed: {metrics.contracts_completed}",
+            f"Contracts failed: {metrics.contracts_failed}",
+            f"Total credits earned: {metrics.total_credits_earned}",
+            f"Current credits: {self.agent_data.credits if self.agent_data else 0}",
+            f"Last contract profit: {metrics.last_contract_profit}",
+            f"Efficiency: {metrics.calculate_efficiency():.2f} contracts/hour",
+            f"Errors encountered: {metrics.errors_encountered}",
+        ]
+        self.logger.info("\n".join(lines))
 
 
 # Import here to avoid circular imports
@@ -2,28 +2,49 @@
 Data models for contracts.
 """
 
-from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import datetime, timezone
 from enum import Enum
 
+# Shared default for missing nested objects; only ever read, never stored or mutated
+_EMPTY: Dict[str, Any] = {}
 
-class ContractType(Enum):
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 API timestamp, which uses a trailing 'Z' for UTC."""
+    if sys.version_info >= (3, 11):
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class ContractType(str, Enum):
     """Contract types."""
     PROCUREMENT = "PROCUREMENT"
     TRANSPORT = "TRANSPORT"
     SHUTTLE = "SHUTTLE"
+    
+    @classmethod
+    def coerce(cls, value: Any, default: 'ContractType') -> 'ContractType':
+        """Look up the member for an API value, falling back to `default` if unknown."""
+        return cls._value2member_map_.get(value, default)
 
 
-class ContractStatus(Enum):
+class ContractStatus(str, Enum):
     """Contract status."""
     AVAILABLE = "AVAILABLE"
     ACCEPTED = "ACCEPTED"
     FULFILLED = "FULFILLED"
     FAILED = "FAILED"
+    
+    @classmethod
+    def coerce(cls, value: Any, default: 'ContractStatus') -> 'ContractStatus':
+        """Look up the member for an API value, falling back to `default` if unknown."""
+        return cls._value2member_map_.get(value, default)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractDelivery:
     """Contract delivery requirement."""
     trade_symbol: str
@@ -52,13 +73,32 @@ class ContractDelivery:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractTerms:
     """Contract terms and payments."""
-    deadline: datetime
+    deadline_str: str  # Raw API timestamp; parsed on first access to `deadline`
     payment_on_accepted: int
     payment_on_fulfilled: int
-    deliveries: List[ContractDelivery]
+    deliveries_data: Sequence[Dict[str, Any]] = ()  # Raw 'deliver' entries; built into objects on first access
+    _deadline: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    _deliveries: Optional[Tuple[ContractDelivery, ...]] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def deadline(self) -> datetime:
+        """Get the contract deadline."""
+        if self._deadline is None:
+            self._deadline = _parse_timestamp(self.deadline_str) if self.deadline_str else datetime.now(timezone.utc)
+        return self._deadline
+    
+    @property
+    def deliveries(self) -> Tuple[ContractDelivery, ...]:
+        """Get the delivery requirements."""
+        if self._deliveries is None:
+            self._deliveries = tuple([
+                ContractDelivery.from_api_response(delivery)
+                for delivery in self.deliveries_data
+            ])
+        return self._deliveries
     
     @property
     def total_payment(self) -> int:
@@ -68,29 +108,26 @@ class ContractTerms:
     @property
     def is_expired(self) -> bool:
         """Check if contract is expired."""
-        now = datetime.now(timezone.utc)
+        return self.is_expired_at(datetime.now(timezone.utc))
+    
+    def is_expired_at(self, now: datetime) -> bool:
+        """Check expiry against an already-sampled clock."""
         return now > self.deadline
     
     @classmethod
     def from_api_response(cls, data: Dict[str, Any]) -> 'ContractTerms':
         """Create ContractTerms from API response."""
-        deadline_str = data.get('deadline', '')
-        deadline = datetime.fromisoformat(deadline_str.replace('Z', '+00:00')) if deadline_str else datetime.now(timezone.utc)
-        
-        deliveries = [
-            ContractDelivery.from_api_response(delivery)
-            for delivery in data.get('deliver', [])
-        ]
+        payment = data.get('payment', _EMPTY)
         
         return cls(
-            deadline=deadline,
-            payment_on_accepted=data.get('payment', {}).get('onAccepted', 0),
-            payment_on_fulfilled=data.get('payment', {}).get('onFulfilled', 0),
-            deliveries=deliveries
+            deadline_str=data.get('deadline', ''),
+            payment_on_accepted=payment.get('onAccepted', 0),
+            payment_on_fulfilled=payment.get('onFulfilled', 0),
+            deliveries_data=data.get('deliver', ())
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Contract:
     """Contract data model."""
     contract_id: str
@@ -116,47 +153,74 @@ class Contract:
     @property
     def is_expired(self) -> bool:
         """Check if contract is expired."""
-        now = datetime.now(timezone.utc)
+        return self.is_expired_at(datetime.now(timezone.utc))
+    
+    def is_expired_at(self, now: datetime) -> bool:
+        """Check expiry against an already-sampled clock."""
         if self.expiration:
             return now > self.expiration
-        return self.terms.is_expired
+        return self.terms.is_expired_at(now)
+    
+    @property
+    def remaining_units_stats(self) -> Tuple[int, int]:
+        """Get (total, largest single delivery) of the units still owed, in one pass."""
+        total = 0
+        largest = 0
+        for delivery in self.terms.deliveries:
+            remaining = delivery.units_required - delivery.units_fulfilled
+            if remaining > 0:
+                total += remaining
+                if remaining > largest:
+                    largest = remaining
+        return total, largest
+    
+    @property
+    def max_remaining_units(self) -> int:
+        """Get the largest number of units still owed on any single delivery."""
+        return self.remaining_units_stats[1]
     
     @property
     def all_deliveries_completed(self) -> bool:
         """Check if all deliveries are completed."""
         return all(delivery.is_completed for delivery in self.terms.deliveries)
     
-    def calculate_profitability_score(self, cargo_capacity: int, estimated_costs: int = 0) -> float:
+    def calculate_profitability_score(self, cargo_capacity: int, estimated_costs: int = 0,
+                                      now: Optional[datetime] = None) -> float:
         """
         Calculate a profitability score for this contract.
         
         Args:
             cargo_capacity: Available cargo capacity
             estimated_costs: Estimated costs for fulfilling the contract
+            now: Current time; sampled from the clock when not given
             
         Returns:
             Float score (higher is better, negative means unprofitable)
         """
-        if self.is_expired:
+        terms = self.terms
+        if now is None:
+            now = datetime.now(timezone.utc)  # Sampled once for the expiry check and the time factor
+        
+        if self.is_expired_at(now):
             return -1000.0  # Heavily penalize expired contracts
         
-        total_units_needed = sum(delivery.remaining_units for delivery in self.terms.deliveries)
+        total_units_needed = self.remaining_units_stats[0]
         
         if total_units_needed > cargo_capacity:
             return -500.0  # Cannot fulfill with available capacity
         
-        profit = self.terms.total_payment - estimated_costs
+        total_payment = terms.payment_on_accepted + terms.payment_on_fulfilled
+        profit = total_payment - estimated_costs
         
         if profit <= 0:
             return -100.0  # Unprofitable
         
         # Score based on profit per unit and profit margin
         profit_per_unit = profit / max(1, total_units_needed)
-        profit_margin = profit / max(1, self.terms.total_payment)
+        profit_margin = profit / max(1, total_payment)
         
         # Time factor - prefer contracts with more time remaining
-        now = datetime.now(timezone.utc)
-        time_remaining = (self.terms.deadline - now).total_seconds()
+        time_remaining = (terms.deadline - now).total_seconds()
         time_factor = min(1.0, time_remaining / 86400)  # Normalize to 1 day
         
         score = profit_per_unit * profit_margin * time_factor * 100
@@ -165,18 +229,14 @@ class Contract:
     @classmethod
     def from_api_response(cls, data: Dict[str, Any]) -> 'Contract':
         """Create Contract from API response."""
-        contract_type_str = data.get('type', 'PROCUREMENT')
-        try:
-            contract_type = ContractType(contract_type_str)
-        except ValueError:
-            contract_type = ContractType.PROCUREMENT
+        contract_type = ContractType.coerce(data.get('type'), ContractType.PROCUREMENT)
         
-        terms = ContractTerms.from_api_response(data.get('terms', {}))
+        terms = ContractTerms.from_api_response(data.get('terms', _EMPTY))
         
         expiration_str = data.get('expiration')
         expiration = None
         if expiration_str:
-            expiration = datetime.fromisoformat(expiration_str.replace('Z', '+00:00'))
+            expiration = _parse_timestamp(expiration_str)
         
         return cls(
             contract_id=data.get('id', ''),
@@ -186,4 +246,32 @@ class Contract:
             accepted=data.get('accepted', False),
             fulfilled=data.get('fulfilled', False),
             expiration=expiration
-        )
\ No newline at end of file
+        )
+
+
+def score_contracts(contracts: Sequence[Contract], cargo_capacity: int,
+                    estimated_costs: Optional[Sequence[int]] = None,
+                    now: Optional[datetime] = None) -> List[float]:
+    """
+    Score a batch of candidate contracts against the same fleet capacity.
+    
+    The clock is read once for the whole batch, so every contract is judged
+    at the same instant.
+    
+    Args:
+        contracts: Candidate contracts
+        cargo_capacity: Available cargo capacity
+        estimated_costs: Optional estimated cost per contract, aligned with `contracts`
+        now: Current time; sampled from the clock when not given
+        
+    Returns:
+        List of scores in the same order as `contracts`
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    if estimated_costs is None:
+        return [contract.calculate_profitability_score(cargo_capacity, 0, now) for contract in contracts]
+    return [
+        contract.calculate_profitability_score(cargo_capacity, cost, now)
+        for contract, cost in zip(contracts, estimated_costs)
+    ]
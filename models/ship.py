@@ -2,19 +2,28 @@
 Data models for ships and cargo.
 """
 
+import time
 from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 from enum import Enum
 
+# Shared default for missing nested objects; only ever read, never stored or mutated
+_EMPTY: Dict[str, Any] = {}
 
-class ShipNavStatus(Enum):
+
+class ShipNavStatus(str, Enum):
     """Ship navigation status."""
     IN_TRANSIT = "IN_TRANSIT"
     IN_ORBIT = "IN_ORBIT"
     DOCKED = "DOCKED"
+    
+    @classmethod
+    def coerce(cls, value: Any, default: 'ShipNavStatus') -> 'ShipNavStatus':
+        """Look up the member for an API value, falling back to `default` if unknown."""
+        return cls._value2member_map_.get(value, default)
 
 
-class ShipRole(Enum):
+class ShipRole(str, Enum):
     """Ship roles."""
     COMMAND = "COMMAND"
     TRANSPORT = "TRANSPORT"
@@ -23,9 +32,18 @@ class ShipRole(Enum):
     EXCAVATOR = "EXCAVATOR"
     INTERCEPTOR = "INTERCEPTOR"
     REFINERY = "REFINERY"
+    
+    @classmethod
+    def coerce(cls, value: Any, default: 'ShipRole') -> 'ShipRole':
+        """Look up the member for an API value, falling back to `default` if unknown."""
+        return cls._value2member_map_.get(value, default)
+
 
+# Navigation states in which a ship is present at a waypoint
+_AT_WAYPOINT = frozenset({ShipNavStatus.DOCKED, ShipNavStatus.IN_ORBIT})
 
-@dataclass
+
+@dataclass(slots=True)
 class ShipCargoItem:
     """Item in ship cargo."""
     symbol: str
@@ -42,14 +60,27 @@ class ShipCargoItem:
             description=data.get('description', ''),
             units=data.get('units', 0)
         )
+    
+    def update_from_api_response(self, data: Dict[str, Any]) -> None:
+        """Overwrite this item in place from API response."""
+        self.symbol = data.get('symbol', '')
+        self.name = data.get('name', '')
+        self.description = data.get('description', '')
+        self.units = data.get('units', 0)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipCargo:
     """Ship cargo information."""
     capacity: int
     units: int
     inventory: List[ShipCargoItem] = field(default_factory=list)
+    # symbol -> units, kept in step with inventory for O(1) lookups
+    _index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the symbol index from the inventory."""
+        self._index = {item.symbol: item.units for item in self.inventory}
     
     @property
     def available_space(self) -> int:
@@ -63,10 +94,7 @@ class ShipCargo:
     
     def get_item_quantity(self, symbol: str) -> int:
         """Get quantity of a specific item."""
-        for item in self.inventory:
-            if item.symbol == symbol:
-                return item.units
-        return 0
+        return self._index.get(symbol, 0)
     
     def has_item(self, symbol: str, quantity: int = 1) -> bool:
         """Check if cargo has sufficient quantity of an item."""
@@ -77,7 +105,7 @@ class ShipCargo:
         """Create ShipCargo from API response."""
         inventory = [
             ShipCargoItem.from_api_response(item_data)
-            for item_data in data.get('inventory', [])
+            for item_data in data.get('inventory', ())
         ]
         
         return cls(
@@ -85,9 +113,26 @@ class ShipCargo:
             units=data.get('units', 0),
             inventory=inventory
         )
+    
+    def update_from_api_response(self, data: Dict[str, Any]) -> None:
+        """Overwrite this cargo in place from API response, reusing existing item objects."""
+        self.capacity = data.get('capacity', 0)
+        self.units = data.get('units', 0)
+        
+        inventory = self.inventory
+        items_data = data.get('inventory', ())
+        for position, item_data in enumerate(items_data):
+            if position < len(inventory):
+                inventory[position].update_from_api_response(item_data)
+            else:
+                inventory.append(ShipCargoItem.from_api_response(item_data))
+        
+        del inventory[len(items_data):]
+        
+        self._index = {item.symbol: item.units for item in inventory}
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipNav:
     """Ship navigation information."""
     system_symbol: str
@@ -95,41 +140,72 @@ class ShipNav:
     route: Dict[str, Any]
     status: ShipNavStatus
     flight_mode: str = "CRUISE"
+    expected_arrival_ts: Optional[float] = None  # Epoch seconds of route arrival while in transit
+    
+    @property
+    def current_status(self) -> ShipNavStatus:
+        """
+        Get the navigation status as of now.
+        
+        `status` is what the API last reported; a ship reported IN_TRANSIT whose
+        route arrival is behind us is derived as IN_ORBIT at its destination, so
+        it reads as at a waypoint without another API call. Every status check
+        goes through this, and nothing is changed in place.
+        """
+        if (self.status == ShipNavStatus.IN_TRANSIT and self.expected_arrival_ts is not None
+                and time.time() >= self.expected_arrival_ts):
+            return ShipNavStatus.IN_ORBIT
+        return self.status
     
     @property
     def is_in_transit(self) -> bool:
-        """Check if ship is in transit."""
-        return self.status == ShipNavStatus.IN_TRANSIT
+        """Check if ship is in transit, treating it as arrived once its arrival time has passed."""
+        return self.current_status == ShipNavStatus.IN_TRANSIT
+    
+    @staticmethod
+    def _arrival_ts(status: ShipNavStatus, route: Dict[str, Any]) -> Optional[float]:
+        """Get the route arrival as epoch seconds, if the ship is in transit."""
+        arrival = route.get('arrival')
+        if status != ShipNavStatus.IN_TRANSIT or not arrival:
+            return None
+        return _parse_timestamp(arrival).timestamp()
     
     @property
     def is_docked(self) -> bool:
         """Check if ship is docked."""
-        return self.status == ShipNavStatus.DOCKED
+        return self.current_status == ShipNavStatus.DOCKED
     
     @property
     def is_in_orbit(self) -> bool:
         """Check if ship is in orbit."""
-        return self.status == ShipNavStatus.IN_ORBIT
+        return self.current_status == ShipNavStatus.IN_ORBIT
     
     @classmethod
     def from_api_response(cls, data: Dict[str, Any]) -> 'ShipNav':
         """Create ShipNav from API response."""
-        status_str = data.get('status', 'IN_ORBIT')
-        try:
-            status = ShipNavStatus(status_str)
-        except ValueError:
-            status = ShipNavStatus.IN_ORBIT
+        status = ShipNavStatus.coerce(data.get('status'), ShipNavStatus.IN_ORBIT)
+        route = data.get('route', {})
         
         return cls(
             system_symbol=data.get('systemSymbol', ''),
             waypoint_symbol=data.get('waypointSymbol', ''),
-            route=data.get('route', {}),
+            route=route,
             status=status,
-            flight_mode=data.get('flightMode', 'CRUISE')
+            flight_mode=data.get('flightMode', 'CRUISE'),
+            expected_arrival_ts=cls._arrival_ts(status, route)
         )
+    
+    def update_from_api_response(self, data: Dict[str, Any]) -> None:
+        """Overwrite this navigation state in place from API response."""
+        self.status = ShipNavStatus.coerce(data.get('status'), ShipNavStatus.IN_ORBIT)
+        self.system_symbol = data.get('systemSymbol', '')
+        self.waypoint_symbol = data.get('waypointSymbol', '')
+        self.route = data.get('route', {})
+        self.flight_mode = data.get('flightMode', 'CRUISE')
+        self.expected_arrival_ts = self._arrival_ts(self.status, self.route)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipFuel:
     """Ship fuel information."""
     current: int
@@ -161,9 +237,15 @@ class ShipFuel:
             capacity=data.get('capacity', 0),
             consumed=data.get('consumed', {})
         )
+    
+    def update_from_api_response(self, data: Dict[str, Any]) -> None:
+        """Overwrite this fuel state in place from API response."""
+        self.current = data.get('current', 0)
+        self.capacity = data.get('capacity', 0)
+        self.consumed = data.get('consumed', {})
 
 
-@dataclass
+@dataclass(slots=True)
 class Ship:
     """Ship data model."""
     symbol: str
@@ -177,15 +259,14 @@ class Ship:
     mounts: List[Dict[str, Any]]
     cargo: ShipCargo
     fuel: ShipFuel
+    _role: Optional[ShipRole] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def role(self) -> ShipRole:
-        """Get ship role from registration."""
-        role_str = self.registration.get('role', 'COMMAND')
-        try:
-            return ShipRole(role_str)
-        except ValueError:
-            return ShipRole.COMMAND
+        """Get ship role from registration (parsed once; registration doesn't change)."""
+        if self._role is None:
+            self._role = ShipRole.coerce(self.registration.get('role'), ShipRole.COMMAND)
+        return self._role
     
     @property
     def cargo_capacity(self) -> int:
@@ -199,7 +280,7 @@ class Ship:
     @property
     def is_at_waypoint(self) -> bool:
         """Check if ship is at a waypoint (docked or in orbit)."""
-        return self.nav.status in [ShipNavStatus.DOCKED, ShipNavStatus.IN_ORBIT]
+        return self.nav.current_status in _AT_WAYPOINT
     
     def can_carry_cargo(self, units: int) -> bool:
         """Check if ship can carry additional cargo."""
@@ -208,18 +289,14 @@ class Ship:
     def is_suitable_for_contract(self, contract: 'Contract') -> bool:
         """Check if ship is suitable for a contract."""
         # Check if ship has enough cargo capacity for any single delivery
-        max_delivery = max(
-            (delivery.remaining_units for delivery in contract.terms.deliveries),
-            default=0
-        )
-        return self.cargo_capacity >= max_delivery
+        return self.cargo.capacity >= contract.max_remaining_units
     
     @classmethod
     def from_api_response(cls, data: Dict[str, Any]) -> 'Ship':
         """Create Ship from API response."""
-        nav_data = data.get('nav', {})
-        cargo_data = data.get('cargo', {})
-        fuel_data = data.get('fuel', {})
+        nav_data = data.get('nav', _EMPTY)
+        cargo_data = data.get('cargo', _EMPTY)
+        fuel_data = data.get('fuel', _EMPTY)
         
         return cls(
             symbol=data.get('symbol', ''),
@@ -234,7 +311,22 @@ class Ship:
             cargo=ShipCargo.from_api_response(cargo_data),
             fuel=ShipFuel.from_api_response(fuel_data)
         )
+    
+    def update_from_api_response(self, data: Dict[str, Any]) -> None:
+        """Overwrite this ship in place from API response instead of building a new one."""
+        self.symbol = data.get('symbol', '')
+        self.registration = data.get('registration', {})
+        self._role = None
+        self.nav.update_from_api_response(data.get('nav', _EMPTY))
+        self.crew = data.get('crew', {})
+        self.frame = data.get('frame', {})
+        self.reactor = data.get('reactor', {})
+        self.engine = data.get('engine', {})
+        self.modules = data.get('modules', [])
+        self.mounts = data.get('mounts', [])
+        self.cargo.update_from_api_response(data.get('cargo', _EMPTY))
+        self.fuel.update_from_api_response(data.get('fuel', _EMPTY))
 
 
 # Import to avoid circular import
-from .contract import Contract  # noqa: E402
\ No newline at end of file
+from .contract import Contract, _parse_timestamp  # noqa: E402
\ No newline at end of file
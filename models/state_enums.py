@@ -2,19 +2,24 @@
 Enumerations for agent states.
 """
 
-from enum import Enum
+from enum import IntEnum
 
 
-class AgentState(Enum):
-    """Enumeration of all possible agent states."""
-    INITIALIZE = "initialize"
-    ASSESS_SITUATION = "assess_situation"
-    NEGOTIATE_CONTRACT = "negotiate_contract"
-    ACCEPT_CONTRACT = "accept_contract"
-    PLAN_FULFILLMENT = "plan_fulfillment"
-    ACQUIRE_RESOURCES = "acquire_resources"
-    EXECUTE_CONTRACT = "execute_contract"
-    DELIVER_GOODS = "deliver_goods"
-    COMPLETE_CONTRACT = "complete_contract"
-    EVALUATE_PERFORMANCE = "evaluate_performance"
-    ERROR_RECOVERY = "error_recovery"
\ No newline at end of file
+class AgentState(IntEnum):
+    """
+    Enumeration of all possible agent states.
+    
+    Values are compact indices (0..N-1) so state handlers can be dispatched
+    from a tuple; use `.name` for display.
+    """
+    INITIALIZE = 0
+    ASSESS_SITUATION = 1
+    NEGOTIATE_CONTRACT = 2
+    ACCEPT_CONTRACT = 3
+    PLAN_FULFILLMENT = 4
+    ACQUIRE_RESOURCES = 5
+    EXECUTE_CONTRACT = 6
+    DELIVER_GOODS = 7
+    COMPLETE_CONTRACT = 8
+    EVALUATE_PERFORMANCE = 9
+    ERROR_RECOVERY = 10
\ No newline at end of file
@@ -4,6 +4,7 @@ ACCEPT_CONTRACT state implementation.
 This state accepts a previously selected contract and prepares for execution.
 """
 
+import logging
 from typing import Optional
 from models.state_enums import AgentState
 from states.base_state import BaseState
@@ -20,6 +21,13 @@ class AcceptContractState(BaseState):
     4. Prepares for contract execution
     """
     
+    __slots__ = ()
+    
+    # Transition targets, bound once at class creation
+    _NEXT = AgentState.PLAN_FULFILLMENT
+    _RETRY = AgentState.NEGOTIATE_CONTRACT
+    _ERR = AgentState.ERROR_RECOVERY
+    
     def execute(self) -> Optional[AgentState]:
         """
         Execute the ACCEPT_CONTRACT state logic.
@@ -33,16 +41,15 @@ class AcceptContractState(BaseState):
             # Verify we have a contract to accept
             if not self.context.current_contract:
                 self.logger.warning("No contract selected for acceptance - returning to negotiation")
-                return AgentState.NEGOTIATE_CONTRACT
+                return self._RETRY
             
             contract = self.context.current_contract
             
             # Check if contract is already accepted
             if contract.accepted:
                 self.logger.info(f"Contract {contract.contract_id} already accepted - proceeding to fulfillment")
-                next_state = AgentState.PLAN_FULFILLMENT
-                self.log_state_exit(next_state)
-                return next_state
+                self.log_state_exit(self._NEXT)
+                return self._NEXT
             
             # Attempt to accept the contract
             success = self._accept_contract(contract)
@@ -59,19 +66,18 @@ class AcceptContractState(BaseState):
                 # Log acceptance details
                 self._log_acceptance_details(contract)
                 
-                next_state = AgentState.PLAN_FULFILLMENT
-                self.log_state_exit(next_state)
-                return next_state
+                self.log_state_exit(self._NEXT)
+                return self._NEXT
                 
             else:
                 self.logger.warning(f"Failed to accept contract {contract.contract_id} - returning to negotiation")
                 # Clear the failed contract
                 self.context.current_contract = None
-                return AgentState.NEGOTIATE_CONTRACT
+                return self._RETRY
                 
         except Exception as e:
             self.logger.error(f"Error in ACCEPT_CONTRACT state: {e}")
-            return AgentState.ERROR_RECOVERY
+            return self._ERR
     
     def _accept_contract(self, contract) -> bool:
         """
@@ -107,7 +113,7 @@ class AcceptContractState(BaseState):
                         self.logger.info(f"Received {credits_gained:,} credits for contract acceptance")
                     
                     # Update agent data
-                    self.context.update_agent_data({'data': agent_data})
+                    self.context.set_agent_data_from_payload(agent_data)
                 
                 return contract.accepted
             else:
@@ -129,45 +135,49 @@ class AcceptContractState(BaseState):
             payment = self.context.current_contract.terms.total_payment
             
             # Simple strategy adjustment - could be more sophisticated
-            if contract_type not in self.context.strategy_config.get('successful_contract_types', []):
-                successful_types = self.context.strategy_config.get('successful_contract_types', [])
+            successful_types = self.context.strategy_config.successful_contract_types
+            if contract_type not in successful_types:
                 successful_types.append(contract_type)
-                self.context.strategy_config['successful_contract_types'] = successful_types
     
     def _log_acceptance_details(self, contract) -> None:
         """Log details about the accepted contract."""
-        self.logger.info("=== CONTRACT ACCEPTED ===")
-        self.logger.info(f"Contract ID: {contract.contract_id}")
-        self.logger.info(f"Type: {contract.contract_type.value}")
-        self.logger.info(f"Faction: {contract.faction_symbol}")
-        self.logger.info(f"Total Payment: {contract.terms.total_payment:,} credits")
-        self.logger.info(f"Payment on Accept: {contract.terms.payment_on_accepted:,} credits")
-        self.logger.info(f"Payment on Fulfill: {contract.terms.payment_on_fulfilled:,} credits")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        lines = [
+            "=== CONTRACT ACCEPTED ===",
+            f"Contract ID: {contract.contract_id}",
+            f"Type: {contract.contract_type.value}",
+            f"Faction: {contract.faction_symbol}",
+            f"Total Payment: {contract.terms.total_payment:,} credits",
+            f"Payment on Accept: {contract.terms.payment_on_accepted:,} credits",
+            f"Payment on Fulfill: {contract.terms.payment_on_fulfilled:,} credits",
+        ]
         
         # Log deliveries
-        self.logger.info("Required Deliveries:")
-        for i, delivery in enumerate(contract.terms.deliveries, 1):
-            self.logger.info(f"  {i}. {delivery.units_required} {delivery.trade_symbol} "
-                           f"to {delivery.destination_symbol}")
+        lines.append("Required Deliveries:")
+        lines.extend([
+            f"  {i}. {delivery.units_required} {delivery.trade_symbol} to {delivery.destination_symbol}"
+            for i, delivery in enumerate(contract.terms.deliveries, 1)
+        ])
         
         # Log deadline
-        from datetime import datetime, timezone
-        now = datetime.now(timezone.utc)
-        time_remaining = contract.terms.deadline - now
+        time_remaining = contract.terms.deadline - self.context.now()
         hours_remaining = time_remaining.total_seconds() / 3600
         days_remaining = hours_remaining / 24
         
-        self.logger.info(f"Deadline: {contract.terms.deadline}")
+        lines.append(f"Deadline: {contract.terms.deadline}")
         if days_remaining >= 1:
-            self.logger.info(f"Time remaining: {days_remaining:.1f} days")
+            lines.append(f"Time remaining: {days_remaining:.1f} days")
         else:
-            self.logger.info(f"Time remaining: {hours_remaining:.1f} hours")
+            lines.append(f"Time remaining: {hours_remaining:.1f} hours")
         
         # Log current resources
         if self.context.agent_data:
-            self.logger.info(f"Current Credits: {self.context.agent_data.credits:,}")
+            lines.append(f"Current Credits: {self.context.agent_data.credits:,}")
         
         total_cargo = self.context.get_total_cargo_capacity()
         available_cargo = self.context.get_available_cargo_space()
-        self.logger.info(f"Cargo Capacity: {available_cargo}/{total_cargo} available")
-        self.logger.info("=========================")
\ No newline at end of file
+        lines.append(f"Cargo Capacity: {available_cargo}/{total_cargo} available")
+        lines.append("=========================")
+        self.logger.info("\n".join(lines))
\ No newline at end of file
@@ -4,12 +4,21 @@ ACQUIRE_RESOURCES state implementation.
 This state handles purchasing ships and upgrading existing ones to meet contract requirements.
 """
 
+import logging
+import time
+from functools import partial
 from typing import Optional, List, Dict, Any
 from models.state_enums import AgentState
 from states.base_state import BaseState
 from models.ship import Ship
 
 
+# How long to stay out of ACQUIRE_RESOURCES after each kind of failure
+NO_SHIPYARDS_RETRY_DELAY = 60
+NO_SHIPS_IN_STOCK_RETRY_DELAY = 300  # Shipyards need time to restock
+PURCHASE_FAILED_RETRY_DELAY = 30
+
+
 class AcquireResourcesState(BaseState):
     """
     State for acquiring additional resources (ships, upgrades, fuel) to meet contract requirements.
@@ -21,6 +30,8 @@ class AcquireResourcesState(BaseState):
     4. Ensures ships are fueled and ready
     """
     
+    __slots__ = ()
+    
     def execute(self) -> Optional[AgentState]:
         """
         Execute the ACQUIRE_RESOURCES state logic.
@@ -47,14 +58,9 @@ class AcquireResourcesState(BaseState):
                 self.logger.warning("No shipyards found in current system - cannot acquire ships")
                 self.logger.info("Agent will wait for contracts that fit current capacity or explore other systems")
                 
-                # Mark that we tried to acquire resources but failed
-                # This prevents immediate retrying
-                import time
-                self.context.strategy_config['last_acquire_attempt'] = time.time()
-                self.context.strategy_config['acquire_failed'] = True
-                
-                # Fall back to trying contracts with current capacity, but wait longer
-                time.sleep(60)  # Wait 1 minute before trying again
+                # Fall back to trying contracts with current capacity; the agent
+                # won't re-enter this state until the retry delay has passed
+                self._defer_retry(NO_SHIPYARDS_RETRY_DELAY)
                 next_state = AgentState.NEGOTIATE_CONTRACT
                 self.log_state_exit(next_state)
                 return next_state
@@ -65,13 +71,8 @@ class AcquireResourcesState(BaseState):
                 self.logger.warning("Found shipyards but none have ships in stock - cannot acquire ships")
                 self.logger.info("Shipyard inventories refresh periodically - will wait and try again")
                 
-                # Mark that we tried to acquire resources but failed
-                import time
-                self.context.strategy_config['last_acquire_attempt'] = time.time()
-                self.context.strategy_config['acquire_failed'] = True
-                
                 # Wait longer since shipyards need time to restock
-                time.sleep(300)  # Wait 5 minutes before trying again
+                self._defer_retry(NO_SHIPS_IN_STOCK_RETRY_DELAY)
                 next_state = AgentState.NEGOTIATE_CONTRACT
                 self.log_state_exit(next_state)
                 return next_state
@@ -85,8 +86,7 @@ class AcquireResourcesState(BaseState):
                 if not success:
                     self.logger.warning("Failed to purchase suitable cargo ship")
                     # Try again later or with different strategy
-                    import time
-                    time.sleep(30)
+                    self._defer_retry(PURCHASE_FAILED_RETRY_DELAY)
                     next_state = AgentState.NEGOTIATE_CONTRACT
                     self.log_state_exit(next_state)
                     return next_state
@@ -106,6 +106,17 @@ class AcquireResourcesState(BaseState):
             self.logger.error(f"Error in ACQUIRE_RESOURCES state: {e}")
             return AgentState.ERROR_RECOVERY
     
+    def _defer_retry(self, delay: float) -> None:
+        """
+        Keep the agent out of ACQUIRE_RESOURCES for `delay` seconds.
+        
+        This is the only failure back-off for this state: negotiation won't
+        ask for resources, and the main loop won't transition back here,
+        until the stored deadline has passed.
+        """
+        self.context.strategy_config.acquire_retry_after_ts = time.time() + delay
+        self.logger.info(f"Will not retry resource acquisition for {delay} seconds")
+    
     def _analyze_resource_needs(self) -> Dict[str, Any]:
         """
         Analyze what resources the agent currently needs.
@@ -115,8 +126,9 @@ class AcquireResourcesState(BaseState):
         """
         self.logger.info("Analyzing resource needs...")
         
-        current_capacity = self.context.get_total_cargo_capacity()
-        ships_needing_fuel = [ship for ship in self.context.ships if ship.fuel.needs_refuel]
+        fleet = self.context.fleet_snapshot
+        current_capacity = fleet.total_cargo_capacity
+        ships_needing_fuel = fleet.ships_needing_fuel
         
         # Simple heuristic: if we're in this state, we probably need more cargo capacity
         # In a real implementation, this could be more sophisticated
@@ -160,76 +172,42 @@ class AcquireResourcesState(BaseState):
             # Start with headquarters system
             if self.context.agent_data:
                 headquarters = self.context.agent_data.headquarters
-                system_symbol = self.api_client.extract_system_from_waypoint(headquarters)
+                system_symbol = self.context.hq_system_symbol
                 
                 self.logger.info(f"Searching for shipyards in system {system_symbol} (HQ: {headquarters})")
                 
-                # Get ALL waypoints in the headquarters system (with pagination)
-                all_waypoints = []
-                page = 1
-                limit = 20
+                # Repeat searches are served by the client's response cache: waypoint
+                # pages are system data, shipyard details expire on the market TTL
+                shipyard_waypoints = self._scan_shipyard_waypoints(system_symbol)
                 
-                while True:
-                    response = self.api_client.get_system_waypoints(system_symbol, page=page, limit=limit)
-                    waypoints = response.get('data', [])
-                    
-                    if not waypoints:
-                        break
-                    
-                    all_waypoints.extend(waypoints)
-                    self.logger.debug(f"Page {page}: Got {len(waypoints)} waypoints")
-                    
-                    # Check if there are more pages
-                    meta = response.get('meta', {})
-                    total_pages = meta.get('total', 0) // limit + (1 if meta.get('total', 0) % limit > 0 else 0)
-                    
-                    if page >= total_pages or len(waypoints) < limit:
-                        break
-                    
-                    page += 1
-                
-                self.logger.info(f"Found {len(all_waypoints)} total waypoints in system {system_symbol} across {page} pages")
+                # Fetch details of every shipyard concurrently
+                inventories = self.api_client.gather(*[
+                    partial(self._fetch_shipyard, system_symbol, waypoint_symbol)
+                    for waypoint_symbol in shipyard_waypoints
+                ])
                 
-                # Find waypoints with shipyards
-                for waypoint in all_waypoints:
-                    waypoint_symbol = waypoint.get('symbol')
-                    traits = waypoint.get('traits', [])
-                    trait_symbols = [trait.get('symbol') for trait in traits]
+                for waypoint_symbol, shipyard_data in zip(shipyard_waypoints, inventories):
+                    if shipyard_data is None:
+                        continue
                     
-                    self.logger.info(f"Waypoint {waypoint_symbol} has traits: {trait_symbols}")
+                    ships = shipyard_data.get('ships', [])
+                    self.logger.info("Shipyard at %s has %d ships available", waypoint_symbol, len(ships))
                     
-                    has_shipyard = any(trait.get('symbol') == 'SHIPYARD' for trait in traits)
+                    # Log details of available ships
+                    if self.logger.isEnabledFor(logging.INFO):
+                        for ship_info in ships:
+                            self.logger.info(
+                                "  - %s: %s credits, %s cargo capacity",
+                                ship_info.get('type', 'UNKNOWN'),
+                                f"{ship_info.get('purchasePrice', 0):,}",
+                                ship_info.get('cargo', {}).get('capacity', 0),
+                            )
                     
-                    if has_shipyard:
-                        self.logger.info(f"Found shipyard at {waypoint_symbol}")
-                        
-                        try:
-                            # Get shipyard details
-                            shipyard_response = self.api_client.get_shipyard(system_symbol, waypoint_symbol)
-                            shipyard_data = shipyard_response.get('data', {})
-                            
-                            ships_available = len(shipyard_data.get('ships', []))
-                            self.logger.info(f"Shipyard at {waypoint_symbol} has {ships_available} ships available")
-                            
-                            # Log details of available ships
-                            ships = shipyard_data.get('ships', [])
-                            for ship_info in ships:
-                                ship_type = ship_info.get('type', 'UNKNOWN')
-                                price = ship_info.get('purchasePrice', 0)
-                                cargo_info = ship_info.get('cargo', {})
-                                cargo_capacity = cargo_info.get('capacity', 0)
-                                
-                                self.logger.info(f"  - {ship_type}: {price:,} credits, {cargo_capacity} cargo capacity")
-                            
-                            shipyards.append({
-                                'waypoint_symbol': waypoint_symbol,
-                                'system_symbol': system_symbol,
-                                'shipyard_data': shipyard_data
-                            })
-                            
-                        except Exception as e:
-                            self.logger.warning(f"Failed to get shipyard details for {waypoint_symbol}: {e}")
-                            continue
+                    shipyards.append({
+                        'waypoint_symbol': waypoint_symbol,
+                        'system_symbol': system_symbol,
+                        'shipyard_data': shipyard_data
+                    })
             
             self.logger.info(f"Found {len(shipyards)} accessible shipyards")
             return shipyards
@@ -238,6 +216,61 @@ class AcquireResourcesState(BaseState):
             self.logger.error(f"Failed to find shipyards: {e}")
             return []
     
+    def _fetch_shipyard(self, system_symbol: str, waypoint_symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get shipyard details.
+        
+        Errors are logged and turned into None so one failed shipyard
+        doesn't abort a concurrent batch.
+        
+        Returns:
+            Optional[Dict]: Shipyard data, or None if the request failed
+        """
+        try:
+            shipyard_response = self.api_client.get_shipyard(system_symbol, waypoint_symbol)
+            return shipyard_response.get('data', {})
+        except Exception as e:
+            self.logger.warning(f"Failed to get shipyard details for {waypoint_symbol}: {e}")
+            return None
+    
+    def _scan_shipyard_waypoints(self, system_symbol: str) -> List[str]:
+        """
+        Scan every waypoint in a system for the SHIPYARD trait.
+        
+        Args:
+            system_symbol: System to scan
+            
+        Returns:
+            List of waypoint symbols that have a shipyard
+        """
+        # Filter each page of waypoints as it arrives (remaining pages are fetched concurrently)
+        shipyard_waypoints = []
+        waypoint_count = 0
+        page_count = 0
+        log_traits = self.logger.isEnabledFor(logging.INFO)
+        for page in self.api_client.iter_system_waypoint_pages(system_symbol):
+            page_count += 1
+            waypoint_count += len(page)
+            for waypoint in page:
+                # Well-formed waypoints always carry these keys; tolerate malformed ones on the slow path
+                try:
+                    waypoint_symbol = waypoint['symbol']
+                    trait_symbols = {trait['symbol'] for trait in waypoint['traits']}
+                except KeyError:
+                    waypoint_symbol = waypoint.get('symbol')
+                    trait_symbols = {trait.get('symbol') for trait in waypoint.get('traits', ())}
+                
+                if log_traits:
+                    self.logger.info("Waypoint %s has traits: %s", waypoint_symbol, sorted(trait_symbols, key=str))
+                
+                if 'SHIPYARD' in trait_symbols:
+                    self.logger.info("Found shipyard at %s", waypoint_symbol)
+                    shipyard_waypoints.append(waypoint_symbol)
+        
+        self.logger.info(f"Found {waypoint_count} total waypoints in system {system_symbol} across {page_count} pages")
+        
+        return shipyard_waypoints
+    
     def _purchase_cargo_ship(self, shipyards: List[Dict[str, Any]], min_cargo_needed: int) -> bool:
         """
         Purchase a ship with good cargo capacity.
@@ -256,7 +289,7 @@ class AcquireResourcesState(BaseState):
             return False
         
         available_credits = self.context.agent_data.credits
-        safety_reserve = self.context.strategy_config.get('safety_credit_reserve', 10000)
+        safety_reserve = self.context.strategy_config.safety_credit_reserve
         purchasable_credits = available_credits - safety_reserve
         
         self.logger.info(f"Available credits for ship purchase: {purchasable_credits:,}")
@@ -264,38 +297,40 @@ class AcquireResourcesState(BaseState):
         best_ship = None
         best_shipyard = None
         best_value = 0  # Cargo capacity per credit
+        # Per-option logging is only worth formatting when DEBUG is on
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         
+        # Single pass over every (shipyard, ship) pair, keeping a running best
         for shipyard in shipyards:
-            shipyard_data = shipyard['shipyard_data']
-            ships = shipyard_data.get('ships', [])
-            
-            for ship_info in ships:
-                ship_type = ship_info.get('type')
+            for ship_info in shipyard['shipyard_data'].get('ships', ()):
                 price = ship_info.get('purchasePrice', 0)
                 
                 if price > purchasable_credits:
-                    self.logger.debug(f"Ship {ship_type} costs {price:,}, exceeds budget")
+                    if debug:
+                        self.logger.debug("Ship %s costs %s, exceeds budget", ship_info.get('type'), f"{price:,}")
                     continue
                 
                 # Get actual cargo capacity from ship's cargo specification
-                cargo_info = ship_info.get('cargo', {})
-                cargo_capacity = cargo_info.get('capacity', 0)
-                
-                self.logger.debug(f"Ship {ship_type} has {cargo_capacity} cargo capacity (from cargo spec)")
+                cargo_info = ship_info.get('cargo')
+                cargo_capacity = cargo_info.get('capacity', 0) if cargo_info else 0
                 
                 # Skip ships with no cargo capacity (like surveyors)
                 if cargo_capacity <= 0:
-                    self.logger.debug(f"Ship {ship_type} has no cargo capacity - skipping")
+                    if debug:
+                        self.logger.debug("Ship %s has no cargo capacity - skipping", ship_info.get('type'))
                     continue
                 
                 if cargo_capacity < min_cargo_needed:
-                    self.logger.debug(f"Ship {ship_type} has {cargo_capacity} cargo, need at least {min_cargo_needed}")
+                    if debug:
+                        self.logger.debug("Ship %s has %d cargo, need at least %d", ship_info.get('type'), cargo_capacity, min_cargo_needed)
                     continue
                 
                 # Calculate value (cargo per credit)
                 value = cargo_capacity / max(price, 1)
                 
-                self.logger.info(f"Ship option: {ship_type} - {cargo_capacity} cargo, {price:,} credits, value: {value:.6f}")
+                if debug:
+                    self.logger.debug("Ship option: %s - %d cargo, %s credits, value: %.6f",
+                                      ship_info.get('type'), cargo_capacity, f"{price:,}", value)
                 
                 if value > best_value:
                     best_ship = ship_info
@@ -306,6 +341,8 @@ class AcquireResourcesState(BaseState):
             self.logger.warning("No suitable ships found within budget")
             return False
         
+        self.logger.info(f"Best ship option: {best_ship.get('type')} at {best_shipyard['waypoint_symbol']}, value: {best_value:.6f}")
+        
         # Purchase the best ship
         return self._execute_ship_purchase(best_ship, best_shipyard)
     
@@ -353,7 +390,7 @@ class AcquireResourcesState(BaseState):
                 
                 if ship_data:
                     new_ship = Ship.from_api_response(ship_data)
-                    self.context.ships.append(new_ship)
+                    self.context.add_ship(new_ship)
                     
                     self.logger.info(f"✅ Successfully purchased ship {new_ship.symbol}")
                     self.logger.info(f"   Type: {ship_type}")
@@ -363,7 +400,7 @@ class AcquireResourcesState(BaseState):
                 # Update agent credits
                 if agent_data:
                     old_credits = self.context.agent_data.credits
-                    self.context.update_agent_data({'data': agent_data})
+                    self.context.set_agent_data_from_payload(agent_data)
                     new_credits = self.context.agent_data.credits
                     
                     self.logger.info(f"Credits: {old_credits:,} → {new_credits:,} (-{old_credits - new_credits:,})")
@@ -379,26 +416,31 @@ class AcquireResourcesState(BaseState):
     
     def _get_ship_at_waypoint(self, waypoint_symbol: str) -> Optional[Ship]:
         """Get a ship that is at the specified waypoint."""
-        for ship in self.context.ships:
-            if ship.nav.waypoint_symbol == waypoint_symbol:
-                return ship
-        return None
+        # The index reflects the last fleet refresh; check live navigation state so
+        # ships that have since left or arrived (see ShipNav.current_status) count
+        def is_here(ship: Ship) -> bool:
+            return ship.nav.waypoint_symbol == waypoint_symbol and ship.is_at_waypoint
+        
+        ship = next(filter(is_here, self.context.ships_by_waypoint.get(waypoint_symbol, ())), None)
+        if ship is None:
+            ship = next(filter(is_here, self.context.ships), None)
+        return ship
     
     def _move_ship_to_waypoint(self, waypoint_symbol: str) -> bool:
         """Move a ship to the specified waypoint."""
-        # Find the best ship to move (closest, with fuel, etc.)
-        best_ship = None
-        
-        for ship in self.context.ships:
-            if ship.nav.is_in_transit:
-                continue  # Skip ships in transit
-            
-            if ship.fuel.current <= 0:
-                continue  # Skip ships without fuel
-            
-            # For now, just pick the first available ship
-            best_ship = ship
-            break
+        # Prefer a ship the last fleet refresh found ready (not in transit, fueled);
+        # otherwise fall back to any stationary ship with fuel left. The snapshot can
+        # be stale (e.g. a ship sent navigating since), so both re-check live state.
+        best_ship = next(
+            (ship for ship in self.context.fleet_snapshot.ready_ships
+             if not ship.nav.is_in_transit and ship.fuel.current > 0),
+            None
+        )
+        if best_ship is None:
+            best_ship = next(
+                (ship for ship in self.context.ships if not ship.nav.is_in_transit and ship.fuel.current > 0),
+                None
+            )
         
         if not best_ship:
             self.logger.warning("No ship available to move to shipyard")
@@ -415,8 +457,12 @@ class AcquireResourcesState(BaseState):
             response = self.api_client.navigate_ship(best_ship.symbol, waypoint_symbol)
             
             if response:
+                # Track the arrival time locally instead of waiting for it; the ship
+                # reads as in transit until then without another API call
+                nav_data = response.get('data', {}).get('nav')
+                if nav_data:
+                    best_ship.nav.update_from_api_response(nav_data)
                 self.logger.info(f"Ship {best_ship.symbol} navigating to {waypoint_symbol}")
-                # In a real implementation, we might wait for arrival
                 return True
             
         except Exception as e:
@@ -426,24 +472,26 @@ class AcquireResourcesState(BaseState):
     
     def _ensure_ships_fueled(self) -> None:
         """Ensure all ships have adequate fuel."""
-        for ship in self.context.ships:
-            if ship.fuel.needs_refuel and ship.nav.is_docked:
-                try:
-                    self.logger.info(f"Refueling ship {ship.symbol}")
-                    self.api_client.refuel_ship(ship.symbol)
-                except Exception as e:
-                    self.logger.warning(f"Failed to refuel ship {ship.symbol}: {e}")
+        targets = [ship for ship in self.context.ships if ship.fuel.needs_refuel and ship.nav.is_docked]
+        
+        # Refuels are independent, so issue them concurrently
+        self.api_client.gather(*[partial(self._refuel_ship, ship) for ship in targets])
+    
+    def _refuel_ship(self, ship: Ship) -> None:
+        """Refuel one ship, logging rather than raising on failure so other refuels carry on."""
+        try:
+            self.logger.info(f"Refueling ship {ship.symbol}")
+            self.api_client.refuel_ship(ship.symbol)
+        except Exception as e:
+            self.logger.warning(f"Failed to refuel ship {ship.symbol}: {e}")
     
     def _refresh_ship_data(self) -> None:
         """Refresh ship data from the API."""
         try:
-            response = self.api_client.get_my_ships()
+            response = self.api_client.list_all_ships()
             ships_data = response.get('data', [])
             
-            self.context.ships = [
-                Ship.from_api_response(ship_data)
-                for ship_data in ships_data
-            ]
+            self.context.update_ships(ships_data)
             
             total_capacity = self.context.get_total_cargo_capacity()
             self.logger.info(f"Updated ship data - Total cargo capacity: {total_capacity}")
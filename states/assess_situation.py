@@ -4,12 +4,12 @@ ASSESS_SITUATION state implementation.
 This state evaluates the current agent situation and determines the next action.
 """
 
-from typing import Optional
+import logging
+from typing import Optional, Dict, Any, Tuple
 from models.state_enums import AgentState
 from states.base_state import BaseState
 from models.agent_data import AgentData
 from models.contract import Contract
-from models.ship import Ship
 
 
 class AssessSituationState(BaseState):
@@ -22,6 +22,8 @@ class AssessSituationState(BaseState):
     3. Determines the next appropriate action
     """
     
+    __slots__ = ()
+    
     def execute(self) -> Optional[AgentState]:
         """
         Execute the ASSESS_SITUATION state logic.
@@ -32,14 +34,17 @@ class AssessSituationState(BaseState):
         self.log_state_entry()
         
         try:
+            # Fetch agent, ships and contracts concurrently - the calls are independent
+            agent_response, ships_response, contracts_response = self._fetch_situation()
+            
             # Step 1: Update agent data
-            self._update_agent_data()
+            self._update_agent_data(agent_response)
             
             # Step 2: Update ship information
-            self._update_ships()
+            self._update_ships(ships_response)
             
             # Step 3: Update contract information
-            self._update_contracts()
+            self._update_contracts(contracts_response)
             
             # Step 4: Assess situation and determine next action
             next_state = self._determine_next_action()
@@ -51,12 +56,27 @@ class AssessSituationState(BaseState):
             self.logger.error(f"Error in ASSESS_SITUATION state: {e}")
             return AgentState.ERROR_RECOVERY
     
-    def _update_agent_data(self) -> None:
-        """Update agent data from API."""
+    def _fetch_situation(self) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Fetch agent, ship and contract data from the API concurrently.
+        
+        Returns:
+            Tuple of (agent, ships, contracts) API responses
+        """
+        self.logger.info("Fetching agent, ship and contract data...")
+        
+        agent_response, ships_response, contracts_response = self.api_client.gather(
+            self.api_client.get_my_agent,
+            self.api_client.list_all_ships,
+            self.api_client.list_all_contracts,
+        )
+        return agent_response, ships_response, contracts_response
+    
+    def _update_agent_data(self, response: Dict[str, Any]) -> None:
+        """Update agent data from an API response."""
         self.logger.info("Updating agent data...")
         
         try:
-            response = self.api_client.get_my_agent()
             self.context.update_agent_data(response)
             
             if self.context.agent_data:
@@ -69,42 +89,38 @@ class AssessSituationState(BaseState):
             self.logger.error(f"Failed to update agent data: {e}")
             raise
     
-    def _update_ships(self) -> None:
-        """Update ship information from API."""
+    def _update_ships(self, response: Dict[str, Any]) -> None:
+        """Update ship information from an API response."""
         self.logger.info("Updating ship information...")
         
         try:
-            response = self.api_client.get_my_ships()
             ships_data = response.get('data', [])
             
             # Convert API response to Ship objects
-            self.context.ships = [
-                Ship.from_api_response(ship_data)
-                for ship_data in ships_data
-            ]
+            self.context.update_ships(ships_data)
             
             self.logger.info(f"Found {len(self.context.ships)} ships")
             
             # Log ship details
             for ship in self.context.ships:
                 self.logger.info(
-                    f"Ship {ship.symbol}: {ship.role.value} at {ship.nav.waypoint_symbol} "
-                    f"({ship.nav.status.value}) - Cargo: {ship.cargo.units}/{ship.cargo.capacity}"
+                    "Ship %s: %s at %s (%s) - Cargo: %d/%d",
+                    ship.symbol, ship.role.value, ship.nav.waypoint_symbol,
+                    ship.nav.current_status.value, ship.cargo.units, ship.cargo.capacity
                 )
                 
                 if ship.fuel.needs_refuel:
-                    self.logger.warning(f"Ship {ship.symbol} needs refueling ({ship.fuel.percentage:.1f}%)")
+                    self.logger.warning("Ship %s needs refueling (%.1f%%)", ship.symbol, ship.fuel.percentage)
         
         except Exception as e:
             self.logger.error(f"Failed to update ship information: {e}")
             raise
     
-    def _update_contracts(self) -> None:
-        """Update contract information from API."""
+    def _update_contracts(self, response: Dict[str, Any]) -> None:
+        """Update contract information from an API response."""
         self.logger.info("Updating contract information...")
         
         try:
-            response = self.api_client.get_my_contracts()
             contracts_data = response.get('data', [])
             
             # Convert API response to Contract objects
@@ -113,11 +129,18 @@ class AssessSituationState(BaseState):
                 for contract_data in contracts_data
             ]
             
-            # Find active contract (accepted but not fulfilled)
-            active_contracts = [
-                contract for contract in contracts
-                if contract.accepted and not contract.fulfilled and not contract.is_expired
-            ]
+            now = self.context.now()
+            
+            # Partition in one pass: active (accepted but not fulfilled) and available (not accepted)
+            active_contracts = []
+            available_count = 0
+            for contract in contracts:
+                if contract.is_expired_at(now):
+                    continue
+                if not contract.accepted:
+                    available_count += 1
+                elif not contract.fulfilled:
+                    active_contracts.append(contract)
             
             if active_contracts:
                 # Use the first active contract
@@ -129,13 +152,8 @@ class AssessSituationState(BaseState):
                 self.logger.info("No active contracts found")
             
             # Log available contracts
-            available_contracts = [
-                contract for contract in contracts
-                if not contract.accepted and not contract.is_expired
-            ]
-            
-            if available_contracts:
-                self.logger.info(f"Found {len(available_contracts)} available contracts")
+            if available_count:
+                self.logger.info(f"Found {available_count} available contracts")
             else:
                 self.logger.info("No available contracts found")
         
@@ -145,19 +163,22 @@ class AssessSituationState(BaseState):
     
     def _log_contract_details(self, contract: Contract) -> None:
         """Log details of a contract."""
-        self.logger.info(f"Contract {contract.contract_id} details:")
-        self.logger.info(f"  Type: {contract.contract_type.value}")
-        self.logger.info(f"  Faction: {contract.faction_symbol}")
-        self.logger.info(f"  Payment: {contract.terms.total_payment:,} credits")
-        self.logger.info(f"  Deadline: {contract.terms.deadline}")
-        
-        for i, delivery in enumerate(contract.terms.deliveries):
-            remaining = delivery.remaining_units
-            total = delivery.units_required
-            self.logger.info(
-                f"  Delivery {i+1}: {remaining}/{total} {delivery.trade_symbol} "
-                f"to {delivery.destination_symbol}"
-            )
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        lines = [
+            f"Contract {contract.contract_id} details:",
+            f"  Type: {contract.contract_type.value}",
+            f"  Faction: {contract.faction_symbol}",
+            f"  Payment: {contract.terms.total_payment:,} credits",
+            f"  Deadline: {contract.terms.deadline}",
+        ]
+        lines.extend([
+            f"  Delivery {i}: {delivery.remaining_units}/{delivery.units_required} {delivery.trade_symbol} "
+            f"to {delivery.destination_symbol}"
+            for i, delivery in enumerate(contract.terms.deliveries, 1)
+        ])
+        self.logger.info("\n".join(lines))
     
     def _determine_next_action(self) -> AgentState:
         """
@@ -196,23 +217,13 @@ class AssessSituationState(BaseState):
         Returns:
             dict: Assessment results with readiness status and issues
         """
-        assessment = {
-            'ready_ships': [],
-            'ships_needing_fuel': [],
-            'ships_in_transit': [],
-            'total_cargo_capacity': 0,
-            'available_cargo_space': 0
-        }
-        
-        for ship in self.context.ships:
-            assessment['total_cargo_capacity'] += ship.cargo_capacity
-            assessment['available_cargo_space'] += ship.get_available_cargo_space()
-            
-            if ship.nav.is_in_transit:
-                assessment['ships_in_transit'].append(ship.symbol)
-            elif ship.fuel.needs_refuel:
-                assessment['ships_needing_fuel'].append(ship.symbol)
-            else:
-                assessment['ready_ships'].append(ship.symbol)
-        
-        return assessment
\ No newline at end of file
+        # Computed in a single pass when the fleet was last refreshed
+        fleet = self.context.fleet_snapshot
+        
+        return {
+            'ready_ships': [ship.symbol for ship in fleet.ready_ships],
+            'ships_needing_fuel': [ship.symbol for ship in fleet.stationary_needing_fuel],
+            'ships_in_transit': [ship.symbol for ship in fleet.ships_in_transit],
+            'total_cargo_capacity': fleet.total_cargo_capacity,
+            'available_cargo_space': fleet.available_cargo_space
+        }
\ No newline at end of file
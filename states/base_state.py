@@ -19,6 +19,16 @@ class BaseState(ABC):
     and other resources needed for execution.
     """
     
+    # Subclasses declare their own __slots__ (empty if they add no attributes)
+    __slots__ = ('context', 'logger', 'api_client')
+    
+    _state_name: str = ''
+    
+    def __init_subclass__(cls, **kwargs):
+        """Derive the state's log name (e.g. ASSESSSITUATION) once per class."""
+        super().__init_subclass__(**kwargs)
+        cls._state_name = cls.__name__.replace('State', '').upper()
+    
     def __init__(self, context: 'AgentContext'):
         """
         Initialize the state with shared context.
@@ -45,13 +55,11 @@ class BaseState(ABC):
     
     def log_state_entry(self) -> None:
         """Log entry into this state."""
-        state_name = self.__class__.__name__.replace('State', '').upper()
-        self.logger.info(f"Entering state: {state_name}")
+        self.logger.info("Entering state: %s", self._state_name)
     
     def log_state_exit(self, next_state: Optional['AgentState']) -> None:
         """Log exit from this state."""
-        state_name = self.__class__.__name__.replace('State', '').upper()
-        if next_state:
-            self.logger.info(f"Exiting {state_name} -> {next_state.value.upper()}")
+        if next_state is not None:
+            self.logger.info("Exiting %s -> %s", self._state_name, next_state.name)
         else:
-            self.logger.debug(f"Staying in {state_name}")
\ No newline at end of file
+            self.logger.debug("Staying in %s", self._state_name)
\ No newline at end of file
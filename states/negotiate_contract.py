@@ -4,10 +4,20 @@ NEGOTIATE_CONTRACT state implementation.
 This state finds and evaluates available contracts, selecting the best one for acceptance.
 """
 
-from typing import Optional, List
+import logging
+import operator
+import time
+from typing import Optional, List, Dict, Any, Tuple
 from models.state_enums import AgentState
 from states.base_state import BaseState
-from models.contract import Contract
+from models.contract import Contract, score_contracts
+
+
+# Start the background contract fetch this long before a retry wait ends, so the
+# next attempt sees offers and expiries from the end of the wait, not its start
+CONTRACT_PREFETCH_LEAD_S = 2.0
+# A prefetched list older than this when claimed is fetched again
+CONTRACT_PREFETCH_MAX_AGE_S = 5.0
 
 
 class NegotiateContractState(BaseState):
@@ -21,6 +31,15 @@ class NegotiateContractState(BaseState):
     4. Selects the best contract for acceptance
     """
     
+    __slots__ = ('_stats_cache', '_cost_cache')
+    
+    def __init__(self, context):
+        """Initialize the state with empty per-execution contract caches."""
+        super().__init__(context)
+        # contract_id -> (total units, largest delivery) and estimated cost, reset on every execute
+        self._stats_cache: Dict[str, Tuple[int, int]] = {}
+        self._cost_cache: Dict[str, int] = {}
+    
     def execute(self) -> Optional[AgentState]:
         """
         Execute the NEGOTIATE_CONTRACT state logic.
@@ -29,6 +48,8 @@ class NegotiateContractState(BaseState):
             AgentState: Next state to transition to (ACCEPT_CONTRACT or ERROR_RECOVERY)
         """
         self.log_state_entry()
+        self._stats_cache.clear()
+        self._cost_cache.clear()
         
         try:
             # Step 1: Get available contracts
@@ -36,9 +57,9 @@ class NegotiateContractState(BaseState):
             
             if not available_contracts:
                 self.logger.warning("No available contracts found")
-                # Wait a bit before trying again
-                import time
-                time.sleep(10)
+                # Wait a bit before trying again; the main loop does the waiting
+                self.context.schedule_wait(10)
+                self._prefetch_contracts(10)
                 return AgentState.NEGOTIATE_CONTRACT
             
             # Step 2: Filter contracts by capabilities
@@ -57,8 +78,8 @@ class NegotiateContractState(BaseState):
                     return next_state
                 else:
                     # Wait before trying again if it's a temporary issue
-                    import time
-                    time.sleep(30)  # Longer wait for contracts to potentially change
+                    self.context.schedule_wait(30)  # Longer wait for contracts to potentially change
+                    self._prefetch_contracts(30)
                     return AgentState.NEGOTIATE_CONTRACT
             
             # Step 3: Evaluate and rank contracts
@@ -75,8 +96,8 @@ class NegotiateContractState(BaseState):
             else:
                 self.logger.warning("No profitable contracts found")
                 # Wait before trying again
-                import time
-                time.sleep(10)
+                self.context.schedule_wait(10)
+                self._prefetch_contracts(10)
                 return AgentState.NEGOTIATE_CONTRACT
                 
         except Exception as e:
@@ -93,23 +114,21 @@ class NegotiateContractState(BaseState):
         self.logger.info("Retrieving available contracts...")
         
         try:
-            # Get contracts from API
-            response = self.api_client.get_my_contracts()
+            # Get contracts from API, using a list fetched during the last wait if still valid
+            response = self._take_prefetched_contracts()
+            if response is None:
+                response = self.api_client.list_all_contracts()
             contracts_data = response.get('data', [])
             
-            # Convert to Contract objects
-            all_contracts = [
-                Contract.from_api_response(contract_data)
-                for contract_data in contracts_data
-            ]
-            
-            # Filter for available (not accepted, not expired) contracts
+            # Convert to Contract objects and keep the available (not accepted, not expired) ones
+            now = self.context.now()
             available_contracts = [
-                contract for contract in all_contracts
-                if not contract.accepted and not contract.fulfilled and not contract.is_expired
+                contract
+                for contract in (Contract.from_api_response(contract_data) for contract_data in contracts_data)
+                if not contract.accepted and not contract.fulfilled and not contract.is_expired_at(now)
             ]
             
-            self.logger.info(f"Found {len(available_contracts)} available contracts out of {len(all_contracts)} total")
+            self.logger.info(f"Found {len(available_contracts)} available contracts out of {len(contracts_data)} total")
             
             return available_contracts
             
@@ -117,6 +136,64 @@ class NegotiateContractState(BaseState):
             self.logger.error(f"Failed to retrieve contracts: {e}")
             raise
     
+    def _prefetch_contracts(self, wait_s: float) -> None:
+        """
+        Fetch the contract list in the background for the next negotiation attempt.
+        
+        The fetch is timed to finish shortly before the `wait_s` retry wait ends
+        rather than at its start, since the wait is there to let offers change.
+        
+        Args:
+            wait_s: Length of the retry wait just scheduled
+        """
+        future = self.api_client.submit(
+            self._fetch_contracts_timestamped,
+            delay=max(0.0, wait_s - CONTRACT_PREFETCH_LEAD_S),
+        )
+        self.context.contract_prefetch = (self.api_client.write_generation, future)
+    
+    def _fetch_contracts_timestamped(self) -> Tuple[float, Dict[str, Any]]:
+        """Fetch the contract list, returning it with the time the fetch finished."""
+        response = self.api_client.list_all_contracts()
+        return time.time(), response
+    
+    def _take_prefetched_contracts(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim the prefetched contract list.
+        
+        The offered contracts only change through our own writes (e.g. a
+        negotiation) or expiry, which is re-checked locally, so the list is
+        discarded if any write was made since it was requested. It is also
+        discarded if the fetch has not started yet (the wait was cut short)
+        or finished more than CONTRACT_PREFETCH_MAX_AGE_S ago.
+        
+        Returns:
+            The contracts response, or None if there is no usable prefetch
+        """
+        prefetch = self.context.contract_prefetch
+        self.context.contract_prefetch = None
+        if prefetch is None:
+            return None
+        
+        generation, future = prefetch
+        if generation != self.api_client.write_generation:
+            future.cancel()
+            return None
+        # Still pending: the wait was cut short before the delayed fetch started
+        if future.cancel():
+            return None
+        
+        try:
+            fetched_at, response = future.result()
+        except Exception as e:
+            self.logger.debug("Prefetched contract list failed, fetching again: %s", e)
+            return None
+        
+        if time.time() - fetched_at > CONTRACT_PREFETCH_MAX_AGE_S:
+            self.logger.debug("Prefetched contract list is %.1fs old, fetching again", time.time() - fetched_at)
+            return None
+        return response
+    
     def _filter_contracts_by_capabilities(self, contracts: List[Contract]) -> List[Contract]:
         """
         Filter contracts based on agent capabilities.
@@ -134,48 +211,56 @@ class NegotiateContractState(BaseState):
             return []
         
         suitable_contracts = []
-        total_cargo_capacity = self.context.get_total_cargo_capacity()
+        total_cargo_capacity = self.context.total_cargo_capacity
+        largest_ship_capacity = self.context.fleet_snapshot.largest_cargo_capacity
+        spendable_credits = self.context.spendable_credits()
+        info = self.logger.isEnabledFor(logging.INFO)
+        log = self.logger.info
         
+        # Checks run cheapest first so rejected contracts skip the later, costlier ones
         for contract in contracts:
-            # Check if we have enough total cargo capacity
-            total_units_needed = sum(delivery.units_required for delivery in contract.terms.deliveries)
+            total_units_needed, max_delivery_size = self._contract_stats(contract)
             
+            # Check if we have enough total cargo capacity
             if total_units_needed > total_cargo_capacity:
-                self.logger.info(f"Contract {contract.contract_id} requires {total_units_needed} units, "
-                                f"but we only have {total_cargo_capacity} capacity - skipping")
+                if info:
+                    log("Contract %s requires %d units, but we only have %d capacity - skipping",
+                        contract.contract_id, total_units_needed, total_cargo_capacity)
                 continue
             
             # Check if we have sufficient credits for potential costs
             estimated_cost = self._estimate_contract_cost(contract)
-            if not self.context.has_sufficient_credits(estimated_cost):
-                self.logger.info(f"Contract {contract.contract_id} estimated cost {estimated_cost:,} "
-                                f"exceeds available credits - skipping")
+            if spendable_credits is None or estimated_cost > spendable_credits:
+                if info:
+                    log("Contract %s estimated cost %s exceeds available credits - skipping",
+                        contract.contract_id, format(estimated_cost, ","))
                 continue
             
             # Check if we can handle deliveries with our fleet (allowing multi-ship deliveries)
             # For now, we'll be more permissive - if total capacity > total required, we can handle it
             # A more sophisticated implementation could check if deliveries can be split optimally
-            max_delivery_size = max(
-                (delivery.units_required for delivery in contract.terms.deliveries),
-                default=0
-            )
-            largest_ship_capacity = max((ship.cargo_capacity for ship in self.context.ships), default=0)
             
             # Only filter out if even our largest ship can't handle the biggest delivery
             # AND we don't have enough total capacity (safety check)
             if max_delivery_size > largest_ship_capacity and total_units_needed > total_cargo_capacity:
-                self.logger.info(f"Contract {contract.contract_id} largest delivery ({max_delivery_size} units) "
-                                f"exceeds largest ship capacity ({largest_ship_capacity}) and total requirement "
-                                f"({total_units_needed}) exceeds total capacity ({total_cargo_capacity}) - skipping")
+                if info:
+                    log("Contract %s largest delivery (%d units) exceeds largest ship capacity (%d) and "
+                        "total requirement (%d) exceeds total capacity (%d) - skipping",
+                        contract.contract_id, max_delivery_size, largest_ship_capacity,
+                        total_units_needed, total_cargo_capacity)
                 continue
-            elif max_delivery_size > largest_ship_capacity:
-                self.logger.info(f"Contract {contract.contract_id} largest delivery ({max_delivery_size} units) "
-                                f"exceeds largest ship ({largest_ship_capacity}), but may be splittable across fleet - keeping")
             
-            # Log acceptance reason for debugging
-            self.logger.info(f"Contract {contract.contract_id} passed ship capacity check - "
-                            f"largest delivery: {max_delivery_size}, largest ship: {largest_ship_capacity}, "
-                            f"total required: {total_units_needed}, total capacity: {total_cargo_capacity}")
+            if info:
+                if max_delivery_size > largest_ship_capacity:
+                    log("Contract %s largest delivery (%d units) exceeds largest ship (%d), "
+                        "but may be splittable across fleet - keeping",
+                        contract.contract_id, max_delivery_size, largest_ship_capacity)
+                
+                # Log acceptance reason for debugging
+                log("Contract %s passed ship capacity check - largest delivery: %d, largest ship: %d, "
+                    "total required: %d, total capacity: %d",
+                    contract.contract_id, max_delivery_size, largest_ship_capacity,
+                    total_units_needed, total_cargo_capacity)
             
             suitable_contracts.append(contract)
         
@@ -195,30 +280,23 @@ class NegotiateContractState(BaseState):
         if not contracts:
             return AgentState.NEGOTIATE_CONTRACT
         
-        total_cargo_capacity = self.context.get_total_cargo_capacity()
-        capacity_issues = 0
-        credit_issues = 0
-        ship_size_issues = 0
+        total_cargo_capacity = self.context.total_cargo_capacity
+        largest_ship_capacity = self.context.fleet_snapshot.largest_cargo_capacity
+        spendable_credits = self.context.spendable_credits()
         
-        for contract in contracts:
-            total_units_needed = sum(delivery.units_required for delivery in contract.terms.deliveries)
-            estimated_cost = self._estimate_contract_cost(contract)
-            max_delivery_size = max(
-                (delivery.units_required for delivery in contract.terms.deliveries),
-                default=0
-            )
-            
-            # Count reasons for filtering
-            if total_units_needed > total_cargo_capacity:
-                capacity_issues += 1
-            
-            if not self.context.has_sufficient_credits(estimated_cost):
-                credit_issues += 1
-            
-            largest_ship_capacity = max((ship.cargo_capacity for ship in self.context.ships), default=0)
-            # Only count as ship size issue if largest delivery exceeds largest ship AND total exceeds total capacity
-            if max_delivery_size > largest_ship_capacity and total_units_needed > total_cargo_capacity:
-                ship_size_issues += 1
+        # Count reasons for filtering as boolean sums over the per-contract stats
+        stats = [self._contract_stats(contract) for contract in contracts]
+        over_capacity = [max_delivery_size for total_units_needed, max_delivery_size in stats
+                         if total_units_needed > total_cargo_capacity]
+        capacity_issues = len(over_capacity)
+        
+        if spendable_credits is None:
+            credit_issues = len(contracts)
+        else:
+            credit_issues = sum(self._estimate_contract_cost(contract) > spendable_credits for contract in contracts)
+        
+        # Only count as ship size issue if largest delivery exceeds largest ship AND total exceeds total capacity
+        ship_size_issues = sum(max_delivery_size > largest_ship_capacity for max_delivery_size in over_capacity)
         
         self.logger.info(f"Contract filtering analysis: "
                         f"capacity issues: {capacity_issues}/{len(contracts)}, "
@@ -230,24 +308,43 @@ class NegotiateContractState(BaseState):
             # Need more or bigger ships
             if self.context.agent_data and self.context.agent_data.credits > 50000:  # Rough ship cost
                 
-                # Check if we recently failed to acquire resources
-                last_attempt = self.context.strategy_config.get('last_acquire_attempt', 0)
-                acquire_failed = self.context.strategy_config.get('acquire_failed', False)
-                import time
-                
-                # Only try to acquire resources if we haven't recently failed
-                if not acquire_failed or (time.time() - last_attempt) > 3600:  # 1 hour cooldown
+                # Only try to acquire resources once the back-off from a failed attempt has passed
+                retry_in = self.context.strategy_config.acquire_retry_remaining()
+                if not retry_in:
                     return AgentState.ACQUIRE_RESOURCES
                 else:
-                    self.logger.info("Recently failed to acquire resources, will wait for suitable contracts")
+                    self.logger.info(f"Recently failed to acquire resources (retry in {retry_in:.0f}s), will wait for suitable contracts")
         
         # If it's mainly credit issues, or we don't have enough credits for ships
         # Just wait for different contracts or more credits from other sources
         return AgentState.NEGOTIATE_CONTRACT
     
+    def _contract_stats(self, contract: Contract) -> Tuple[int, int]:
+        """
+        Get a contract's delivery totals, computed once per execution.
+        
+        Args:
+            contract: Contract to summarize
+            
+        Returns:
+            Tuple of (total units required, largest single delivery)
+        """
+        stats = self._stats_cache.get(contract.contract_id)
+        if stats is None:
+            total_units = 0
+            max_units = 0
+            for delivery in contract.terms.deliveries:
+                units = delivery.units_required
+                total_units += units
+                if units > max_units:
+                    max_units = units
+            stats = (total_units, max_units)
+            self._stats_cache[contract.contract_id] = stats
+        return stats
+    
     def _estimate_contract_cost(self, contract: Contract) -> int:
         """
-        Estimate the cost to fulfill a contract.
+        Estimate the cost to fulfill a contract (memoized per contract for the current execution).
         
         Args:
             contract: Contract to estimate costs for
@@ -255,10 +352,14 @@ class NegotiateContractState(BaseState):
         Returns:
             int: Estimated cost in credits
         """
+        cached = self._cost_cache.get(contract.contract_id)
+        if cached is not None:
+            return cached
+        
         # Simple cost estimation - in a real implementation, this would be more sophisticated
         # For now, estimate based on goods volume and potential fuel costs
         
-        total_units = sum(delivery.units_required for delivery in contract.terms.deliveries)
+        total_units = self._contract_stats(contract)[0]
         
         # Rough estimates:
         # - 100 credits per unit for goods (very rough average)
@@ -267,9 +368,12 @@ class NegotiateContractState(BaseState):
         estimated_fuel_cost = int(contract.terms.total_payment * 0.1)
         
         total_cost = estimated_goods_cost + estimated_fuel_cost
+        self._cost_cache[contract.contract_id] = total_cost
         
-        self.logger.info(f"Contract {contract.contract_id} estimated cost: {total_cost:,} "
-                         f"(goods: {estimated_goods_cost:,}, fuel: {estimated_fuel_cost:,})")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Contract %s estimated cost: %s (goods: %s, fuel: %s)",
+                             contract.contract_id, format(total_cost, ","),
+                             format(estimated_goods_cost, ","), format(estimated_fuel_cost, ","))
         
         return total_cost
     
@@ -288,30 +392,29 @@ class NegotiateContractState(BaseState):
         if not contracts:
             return None
         
-        cargo_capacity = self.context.get_total_cargo_capacity()
-        contract_scores = []
+        cargo_capacity = self.context.total_cargo_capacity
+        estimated_costs = [self._estimate_contract_cost(contract) for contract in contracts]
+        scores = score_contracts(contracts, cargo_capacity, estimated_costs, self.context.now())
+        contract_scores = list(zip(contracts, scores, estimated_costs))
         
-        for contract in contracts:
-            estimated_cost = self._estimate_contract_cost(contract)
-            score = contract.calculate_profitability_score(cargo_capacity, estimated_cost)
-            
-            contract_scores.append((contract, score, estimated_cost))
-            
-            profit = contract.terms.total_payment - estimated_cost
-            profit_margin = (profit / contract.terms.total_payment) * 100 if contract.terms.total_payment > 0 else 0
-            
-            self.logger.info(f"Contract {contract.contract_id}: "
-                           f"Payment: {contract.terms.total_payment:,}, "
-                           f"Est. Cost: {estimated_cost:,}, "
-                           f"Profit: {profit:,} ({profit_margin:.1f}%), "
-                           f"Score: {score:.2f}")
+        # The per-candidate breakdown is debug detail; the winner is logged at INFO below
+        if self.logger.isEnabledFor(logging.DEBUG):
+            log = self.logger.debug
+            for contract, score, estimated_cost in contract_scores:
+                total_payment = contract.terms.total_payment
+                profit = total_payment - estimated_cost
+                profit_margin = (profit / total_payment) * 100 if total_payment > 0 else 0
+                
+                log("Contract %s: Payment: %s, Est. Cost: %s, Profit: %s (%.1f%%), Score: %.2f",
+                    contract.contract_id, format(total_payment, ","), format(estimated_cost, ","),
+                    format(profit, ","), profit_margin, score)
         
-        # Sort by score (highest first)
-        contract_scores.sort(key=lambda x: x[1], reverse=True)
+        # Only the top score matters, so a linear max replaces a full sort (ties keep the first)
+        best = max(contract_scores, key=operator.itemgetter(1)) if contract_scores else None
         
         # Select the best contract if it has a positive score
-        if contract_scores and contract_scores[0][1] > 0:
-            best_contract, best_score, best_cost = contract_scores[0]
+        if best is not None and best[1] > 0:
+            best_contract, best_score, best_cost = best
             
             profit = best_contract.terms.total_payment - best_cost
             self.logger.info(f"Selected best contract {best_contract.contract_id} "
@@ -324,21 +427,25 @@ class NegotiateContractState(BaseState):
     
     def _log_contract_details(self, contract: Contract) -> None:
         """Log details of the selected contract."""
-        self.logger.info(f"Contract {contract.contract_id} details:")
-        self.logger.info(f"  Type: {contract.contract_type.value}")
-        self.logger.info(f"  Faction: {contract.faction_symbol}")
-        self.logger.info(f"  Payment: {contract.terms.total_payment:,} credits")
-        self.logger.info(f"    - On Accept: {contract.terms.payment_on_accepted:,}")
-        self.logger.info(f"    - On Fulfill: {contract.terms.payment_on_fulfilled:,}")
-        self.logger.info(f"  Deadline: {contract.terms.deadline}")
-        
-        for i, delivery in enumerate(contract.terms.deliveries, 1):
-            self.logger.info(f"  Delivery {i}: {delivery.units_required} {delivery.trade_symbol} "
-                           f"to {delivery.destination_symbol}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        lines = [
+            f"Contract {contract.contract_id} details:",
+            f"  Type: {contract.contract_type.value}",
+            f"  Faction: {contract.faction_symbol}",
+            f"  Payment: {contract.terms.total_payment:,} credits",
+            f"    - On Accept: {contract.terms.payment_on_accepted:,}",
+            f"    - On Fulfill: {contract.terms.payment_on_fulfilled:,}",
+            f"  Deadline: {contract.terms.deadline}",
+        ]
+        lines.extend([
+            f"  Delivery {i}: {delivery.units_required} {delivery.trade_symbol} to {delivery.destination_symbol}"
+            for i, delivery in enumerate(contract.terms.deliveries, 1)
+        ])
         
         # Calculate time remaining
-        from datetime import datetime, timezone
-        now = datetime.now(timezone.utc)
-        time_remaining = contract.terms.deadline - now
+        time_remaining = contract.terms.deadline - self.context.now()
         hours_remaining = time_remaining.total_seconds() / 3600
-        self.logger.info(f"  Time remaining: {hours_remaining:.1f} hours")
\ No newline at end of file
+        lines.append(f"  Time remaining: {hours_remaining:.1f} hours")
+        self.logger.info("\n".join(lines))
\ No newline at end of file
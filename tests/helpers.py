@@ -0,0 +1,48 @@
+"""
+Shared fakes for tests that drive the API client without a network.
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from api.client import SpaceTradersAPIClient
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response as used by the client."""
+    
+    def __init__(self, status_code: int = 200, body: bytes = b'{"data": {}}',
+                 headers: Optional[Dict[str, str]] = None, etag: Optional[str] = None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = dict(headers or {})
+        if etag:
+            self.headers["ETag"] = etag
+    
+    def raise_for_status(self):
+        pass
+
+
+def make_client(test: unittest.TestCase, send_request: Optional[Callable] = None) -> SpaceTradersAPIClient:
+    """
+    Build a client that is closed when `test` finishes.
+    
+    Args:
+        test: Test case that owns the client
+        send_request: Replacement for _send_request, so requests never reach the network
+    
+    Returns:
+        SpaceTradersAPIClient: The client under test
+    """
+    client = SpaceTradersAPIClient(agent_token="test-token")
+    test.addCleanup(client.close)
+    if send_request is not None:
+        client._send_request = send_request
+    return client
+
+
+def route_arriving_in(seconds: float) -> Dict[str, Any]:
+    """Build an API-shaped nav route whose arrival is `seconds` from now, as a 'Z' timestamp."""
+    arrival = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+    return {'arrival': arrival.isoformat().replace('+00:00', 'Z')}
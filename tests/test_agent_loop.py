@@ -0,0 +1,109 @@
+"""
+Tests for how the agent's main loop paces state ticks.
+"""
+
+import os
+import unittest
+from unittest import mock
+
+import agent as agent_module
+from models.state_enums import AgentState
+from tests.helpers import FakeResponse
+
+
+class _FakeState:
+    """Registered state handler that always requests the same next state."""
+    
+    def __init__(self, next_state):
+        self.next_state = next_state
+    
+    def execute(self):
+        return self.next_state
+
+
+class RunLoopDelayTest(unittest.TestCase):
+    """Drive a few ticks of SpaceTradersAgent.run and record the waits between them."""
+    
+    def setUp(self):
+        env = {"AGENT_TOKEN": "test-token", "SPACETRADERS_CACHE_PATH": ""}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        agent_module._get_config.cache_clear()
+        self.addCleanup(agent_module._get_config.cache_clear)
+        
+        self.agent = agent_module.SpaceTradersAgent()
+        self.ticks = 0
+        self.delays = []
+        self.states = []
+    
+    def _run_ticks(self, ticks):
+        """Run exactly `ticks` state ticks and return the waits requested between them."""
+        execute = self.agent.execute_current_state
+        
+        def execute_and_count():
+            self.ticks += 1
+            if self.ticks >= ticks:
+                self.agent.running = False
+            return execute()
+        
+        def sleep_until_woken(seconds):
+            self.delays.append(seconds)
+            self.states.append(self.agent.current_state)
+            return False
+        
+        # Ticks that continue immediately never sleep, so they leave no record
+        self.agent.execute_current_state = execute_and_count
+        self.agent.context.sleep_until_woken = sleep_until_woken
+        self.agent.run()
+        return self.delays
+    
+    def test_legacy_stub_cycle_is_paced(self):
+        # No implemented states: the INITIALIZE -> ... -> EVALUATE stub cycle does no I/O
+        self.agent.state_registry = {}
+        delays = self._run_ticks(8)
+        
+        self.assertEqual(len(delays), 8)
+        for delay in delays:
+            self.assertGreaterEqual(delay, self.agent.poll_interval)
+    
+    def test_implemented_transition_runs_immediately(self):
+        self.agent.current_state = AgentState.NEGOTIATE_CONTRACT
+        self.agent.state_registry = {
+            AgentState.NEGOTIATE_CONTRACT: _FakeState(AgentState.ACCEPT_CONTRACT),
+            AgentState.ACCEPT_CONTRACT: _FakeState(AgentState.ASSESS_SITUATION),
+            AgentState.ASSESS_SITUATION: _FakeState(AgentState.NEGOTIATE_CONTRACT),
+        }
+        delays = self._run_ticks(6)
+        
+        # NEGOTIATE -> ACCEPT continues without waiting, ACCEPT -> ASSESS is paced
+        self.assertEqual(self.states, [AgentState.ASSESS_SITUATION, AgentState.ASSESS_SITUATION])
+        for delay in delays:
+            self.assertGreaterEqual(delay, self.agent.poll_interval)
+    
+    def test_states_after_assessment_reuse_its_agent_data(self):
+        sent = []
+        
+        def send_request(method, endpoint, **kwargs):
+            sent.append(endpoint)
+            return FakeResponse(body=b'{"data": [], "meta": {"total": 0, "page": 1, "limit": 20}}')
+        self.agent.api_client._send_request = send_request
+        
+        class _ListContracts(_FakeState):
+            def execute(state):
+                self.agent.api_client.list_all_contracts()
+                return state.next_state
+        
+        self.agent.current_state = AgentState.ASSESS_SITUATION
+        self.agent.state_registry = {
+            AgentState.ASSESS_SITUATION: _ListContracts(AgentState.NEGOTIATE_CONTRACT),
+            AgentState.NEGOTIATE_CONTRACT: _ListContracts(AgentState.ASSESS_SITUATION),
+        }
+        self._run_ticks(3)
+        
+        # NEGOTIATE reuses the list assessment fetched; the next assessment fetches again
+        self.assertEqual(sent, ["/v2/my/contracts", "/v2/my/contracts"])
+
+
+if __name__ == "__main__":
+    unittest.main()
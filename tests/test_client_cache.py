@@ -0,0 +1,113 @@
+"""
+Tests for the API client's response caching around writes.
+"""
+
+import threading
+import unittest
+
+from tests.helpers import FakeResponse, make_client
+
+
+class WriteDuringGetTest(unittest.TestCase):
+    """A GET that is in flight while a write completes must not cache its body."""
+    
+    def setUp(self):
+        self.client = make_client(self, self._send_request)
+        self.get_sent = threading.Event()
+        self.release_get = threading.Event()
+        self.credits = 100
+    
+    def _send_request(self, method, endpoint, **kwargs):
+        """Serve GET /v2/my/agent with the current credits; POSTs spend credits."""
+        if method == "GET":
+            body = b'{"data": {"credits": %d}}' % self.credits
+            if not self.get_sent.is_set():
+                # First GET: read the pre-write state, then stall until the write is done
+                self.get_sent.set()
+                self.release_get.wait(5)
+            return FakeResponse(body=body)
+        self.credits -= 40
+        return FakeResponse()
+    
+    def _get_agent(self):
+        return self.client._make_request("GET", "/v2/my/agent")
+    
+    def test_get_interleaved_with_post_is_not_cached(self):
+        stale = {}
+        reader = threading.Thread(target=lambda: stale.update(self._get_agent()))
+        reader.start()
+        self.assertTrue(self.get_sent.wait(5))
+        
+        # The write lands while the GET is still waiting for its response
+        self.client._make_request("POST", "/v2/my/ships/SHIP-1/purchase")
+        self.release_get.set()
+        reader.join(5)
+        
+        self.assertEqual(stale["data"]["credits"], 100)
+        self.assertEqual(self._get_agent()["data"]["credits"], 60)
+    
+    def test_get_after_post_does_not_join_earlier_inflight_get(self):
+        results = {}
+        reader = threading.Thread(target=lambda: results.update(first=self._get_agent()))
+        reader.start()
+        self.assertTrue(self.get_sent.wait(5))
+        
+        self.client._make_request("POST", "/v2/my/ships/SHIP-1/purchase")
+        # Must issue its own request rather than share the pre-write one
+        results["second"] = self._get_agent()
+        self.release_get.set()
+        reader.join(5)
+        
+        self.assertEqual(results["first"]["data"]["credits"], 100)
+        self.assertEqual(results["second"]["data"]["credits"], 60)
+    
+    def test_system_cache_skips_body_fetched_across_write(self):
+        def send(method, endpoint, **kwargs):
+            if method == "GET":
+                self.get_sent.set()
+                self.release_get.wait(5)
+                return FakeResponse(body=b'{"data": {"ships": []}}')
+            return FakeResponse()
+        self.client._send_request = send
+        
+        endpoint = "/v2/systems/X1-A/waypoints/X1-A-B/shipyard"
+        reader = threading.Thread(target=lambda: self.client._make_request("GET", endpoint))
+        reader.start()
+        self.assertTrue(self.get_sent.wait(5))
+        self.client._make_request("POST", "/v2/my/ships")
+        self.release_get.set()
+        reader.join(5)
+        
+        self.assertIsNone(self.client.cache.get(self.client._cache_key("GET", endpoint, None)))
+
+
+class AgentCacheScopeTest(unittest.TestCase):
+    """Agent data is shared until the cache is expired, which only drops agent data."""
+    
+    def setUp(self):
+        self.client = make_client(self, self._send_request)
+        self.sent = []
+    
+    def _send_request(self, method, endpoint, **kwargs):
+        self.sent.append(endpoint)
+        return FakeResponse(body=b'{"data": []}')
+    
+    def test_expire_agent_cache_refetches_agent_data(self):
+        self.client.list_all_ships()
+        self.client.list_all_ships()
+        self.assertEqual(len(self.sent), 1)
+        
+        self.client.expire_agent_cache()
+        self.client.list_all_ships()
+        self.assertEqual(len(self.sent), 2)
+    
+    def test_expire_agent_cache_keeps_system_data(self):
+        endpoint = "/v2/systems/X1-A/waypoints/X1-A-B"
+        self.client._make_request("GET", endpoint)
+        self.client.expire_agent_cache()
+        self.client._make_request("GET", endpoint)
+        self.assertEqual(self.sent, [endpoint])
+
+
+if __name__ == "__main__":
+    unittest.main()
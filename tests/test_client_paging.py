@@ -0,0 +1,64 @@
+"""
+Tests for fetching every page of the paginated list endpoints.
+"""
+
+import threading
+import unittest
+
+from tests.helpers import make_client
+
+
+class IterPagesTest(unittest.TestCase):
+    """_iter_pages yields page 1 first, then the remaining pages in order."""
+    
+    def setUp(self):
+        self.client = make_client(self)
+        self.calls = []
+        self.lock = threading.Lock()
+    
+    def _pages(self, total):
+        """Fake paginated endpoint over `total` numbered items."""
+        def fetch_page(page, limit):
+            with self.lock:
+                self.calls.append(page)
+            start = (page - 1) * limit
+            items = list(range(start, min(start + limit, total)))
+            return {'data': items, 'meta': {'total': total, 'page': page, 'limit': limit}}
+        return fetch_page
+    
+    def test_yields_pages_in_order(self):
+        pages = list(self.client._iter_pages(self._pages(45), limit=20))
+        
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual([item for page in pages for item in page], list(range(45)))
+        self.assertEqual(sorted(self.calls), [1, 2, 3])
+        self.assertEqual(self.calls[0], 1)
+    
+    def test_first_page_is_yielded_before_other_pages_are_requested(self):
+        pages = self.client._iter_pages(self._pages(45), limit=20)
+        
+        self.assertEqual(len(next(pages)), 20)
+        self.assertEqual(self.calls, [1])
+        list(pages)
+        self.assertEqual(sorted(self.calls), [1, 2, 3])
+    
+    def test_single_page(self):
+        pages = list(self.client._iter_pages(self._pages(20), limit=20))
+        self.assertEqual(pages, [list(range(20))])
+        self.assertEqual(self.calls, [1])
+    
+    def test_empty_and_missing_meta(self):
+        self.assertEqual(list(self.client._iter_pages(self._pages(0), limit=20)), [[]])
+        
+        pages = self.client._iter_pages(lambda page, limit: {'data': [1, 2]}, limit=20)
+        self.assertEqual(list(pages), [[1, 2]])
+    
+    def test_list_all_collects_every_item(self):
+        response = self.client._list_all(self._pages(45), limit=20)
+        
+        self.assertEqual(response['data'], list(range(45)))
+        self.assertEqual(response['meta']['total'], 45)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests for ETag revalidation of expired cache entries.
+"""
+
+import unittest
+
+from tests.helpers import FakeResponse, make_client
+
+
+class ConditionalGetTest(unittest.TestCase):
+    """Expired entries are revalidated with If-None-Match and 304 reuses the stored body."""
+    
+    ENDPOINT = "/v2/systems/X1-A/waypoints/X1-A-B"
+    
+    def setUp(self):
+        self.client = make_client(self, self._send_request)
+        self.requests = []
+        self.responses = []
+        self.cache_key = self.client._cache_key("GET", self.ENDPOINT, None)
+    
+    def _send_request(self, method, endpoint, **kwargs):
+        self.requests.append(dict(kwargs.get("headers") or {}))
+        return self.responses.pop(0)
+    
+    def _get(self):
+        return self.client._make_request("GET", self.ENDPOINT)
+    
+    def _expire(self):
+        self.client.cache.remove(self.cache_key)
+    
+    def test_not_modified_reuses_stored_body(self):
+        self.responses = [FakeResponse(200, b'{"data": {"symbol": "X1-A-B"}}', etag='"v1"')]
+        first = self._get()
+        self.assertNotIn("If-None-Match", self.requests[0])
+        
+        self._expire()
+        self.responses = [FakeResponse(304, b"")]
+        second = self._get()
+        
+        self.assertEqual(self.requests[1]["If-None-Match"], '"v1"')
+        self.assertIs(second, first)
+        # The revalidated body is cached again for the normal TTL
+        self.assertIs(self.client.cache.get(self.cache_key), first)
+    
+    def test_modified_response_replaces_body_and_etag(self):
+        self.responses = [FakeResponse(200, b'{"data": {"v": 1}}', etag='"v1"')]
+        self._get()
+        
+        self._expire()
+        self.responses = [FakeResponse(200, b'{"data": {"v": 2}}', etag='"v2"')]
+        self.assertEqual(self._get()["data"]["v"], 2)
+        
+        self._expire()
+        self.responses = [FakeResponse(304, b"")]
+        self.assertEqual(self._get()["data"]["v"], 2)
+        self.assertEqual(self.requests[2]["If-None-Match"], '"v2"')
+    
+    def test_no_etag_means_unconditional_refetch(self):
+        self.responses = [FakeResponse(200, b'{"data": {}}')]
+        self._get()
+        
+        self._expire()
+        self.responses = [FakeResponse(200, b'{"data": {}}')]
+        self._get()
+        self.assertNotIn("If-None-Match", self.requests[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Tests for delayed background calls submitted through the API client.
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+
+from tests.helpers import make_client
+
+
+class DelayedSubmitTest(unittest.TestCase):
+    """submit(call, delay) runs the call on the client's workers after the delay."""
+    
+    def setUp(self):
+        self.client = make_client(self)
+    
+    def test_delayed_call_runs_on_worker(self):
+        started = time.monotonic()
+        future = self.client.submit(lambda: (time.monotonic(), threading.current_thread().name), delay=0.05)
+        
+        ran_at, thread_name = future.result(timeout=5)
+        self.assertGreaterEqual(ran_at - started, 0.05)
+        self.assertTrue(thread_name.startswith("spacetraders-api"))
+    
+    def test_exception_is_propagated(self):
+        def fail():
+            raise ValueError("boom")
+        
+        future = self.client.submit(fail, delay=0.01)
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+    
+    def test_cancel_before_delay_skips_call(self):
+        calls = []
+        future = self.client.submit(lambda: calls.append(1), delay=0.05)
+        
+        self.assertTrue(future.cancel())
+        time.sleep(0.1)
+        self.assertEqual(calls, [])
+    
+    def test_close_cancels_pending_calls(self):
+        calls = []
+        future = self.client.submit(lambda: calls.append(1), delay=0.05)
+        
+        self.client.close()
+        time.sleep(0.1)
+        self.assertTrue(future.cancelled())
+        self.assertEqual(calls, [])
+        with self.assertRaises(CancelledError):
+            future.result(timeout=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
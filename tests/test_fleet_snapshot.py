@@ -0,0 +1,64 @@
+"""
+Tests for the fleet aggregates and indexes kept on the agent context.
+"""
+
+import logging
+import unittest
+
+from models.agent_data import AgentContext, FleetSnapshot
+from models.ship import Ship
+from tests.helpers import make_client, route_arriving_in
+
+
+def _ship_data(symbol, status='DOCKED', fuel=100, arrival_in=None):
+    """Build an API-shaped ship payload with `fuel` out of 100 units."""
+    route = route_arriving_in(arrival_in) if arrival_in is not None else {}
+    return {
+        'symbol': symbol,
+        'nav': {'systemSymbol': 'X1-A', 'waypointSymbol': 'X1-A-B', 'route': route, 'status': status},
+        'cargo': {'capacity': 40, 'units': 0, 'inventory': []},
+        'fuel': {'current': fuel, 'capacity': 100},
+    }
+
+
+def _symbols(ships):
+    return [ship.symbol for ship in ships]
+
+
+class FleetSnapshotTest(unittest.TestCase):
+    """Every ship lands in exactly one readiness partition."""
+    
+    def test_partitions_are_disjoint(self):
+        snapshot = FleetSnapshot()
+        for data in (
+            _ship_data('READY'),
+            _ship_data('LOW-FUEL', fuel=10),
+            _ship_data('MOVING-LOW-FUEL', status='IN_TRANSIT', fuel=10, arrival_in=60),
+        ):
+            snapshot.add(Ship.from_api_response(data))
+        
+        self.assertEqual(_symbols(snapshot.ready_ships), ['READY'])
+        self.assertEqual(_symbols(snapshot.stationary_needing_fuel), ['LOW-FUEL'])
+        self.assertEqual(_symbols(snapshot.ships_in_transit), ['MOVING-LOW-FUEL'])
+        self.assertEqual(_symbols(snapshot.ships_needing_fuel), ['LOW-FUEL', 'MOVING-LOW-FUEL'])
+
+
+class UpdateShipsTest(unittest.TestCase):
+    """A refresh that fails part-way leaves the fleet and its index as they were."""
+    
+    def test_failed_update_keeps_index(self):
+        context = AgentContext(api_client=make_client(self), logger=logging.getLogger(__name__))
+        context.update_ships([_ship_data('SHIP-1'), _ship_data('SHIP-2')])
+        ships = context.ships
+        
+        malformed = _ship_data('SHIP-2', status='IN_TRANSIT')
+        malformed['nav']['route'] = {'arrival': 'not-a-timestamp'}
+        with self.assertRaises(ValueError):
+            context.update_ships([_ship_data('SHIP-1'), malformed])
+        
+        self.assertIs(context.ships, ships)
+        self.assertEqual(sorted(context.ships_by_symbol), ['SHIP-1', 'SHIP-2'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for the adaptive token bucket used to rate-limit API requests.
+"""
+
+import unittest
+from unittest import mock
+
+from api.client import MAX_RETRY_AFTER
+from api.rate_limiter import TokenBucket
+from tests.helpers import FakeResponse, make_client
+
+
+class _Clock:
+    """Controllable stand-in for time.monotonic and time.sleep."""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    """Refill, penalty and adaptive-rate behaviour of TokenBucket."""
+    
+    def setUp(self):
+        self.clock = _Clock()
+        patcher = mock.patch.multiple("api.rate_limiter.time", monotonic=self.clock.monotonic,
+                                      sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bucket = TokenBucket(capacity=2, refill_rate=2.0)
+    
+    def test_burst_then_waits_for_refill(self):
+        self.bucket.acquire()
+        self.bucket.acquire()
+        self.assertEqual(self.clock.slept, [])
+        
+        # Empty bucket: the third token takes 1 / refill_rate seconds to arrive
+        self.bucket.acquire()
+        self.assertAlmostEqual(sum(self.clock.slept), 0.5)
+    
+    def test_refill_is_capped_at_capacity(self):
+        self.bucket.acquire()
+        self.bucket.acquire()
+        self.clock.now += 60
+        
+        for _ in range(2):
+            self.bucket.acquire()
+        self.assertEqual(self.clock.slept, [])
+        self.bucket.acquire()
+        self.assertAlmostEqual(sum(self.clock.slept), 0.5)
+    
+    def test_penalize_blocks_until_delay_passes(self):
+        self.bucket.penalize(3.0)
+        self.assertAlmostEqual(self.bucket.blocked_remaining(), 3.0)
+        
+        self.bucket.acquire()
+        # Waits out the penalty, then for one token to refill from the drained bucket
+        self.assertAlmostEqual(sum(self.clock.slept), 3.5)
+        self.assertEqual(self.bucket.blocked_remaining(), 0.0)
+    
+    def test_no_refill_during_penalty(self):
+        self.bucket.penalize(3.0)
+        self.clock.now += 3.0
+        self.bucket.acquire()
+        self.assertAlmostEqual(sum(self.clock.slept), 0.5)
+    
+    def test_throttling_halves_rate_and_success_recovers_it(self):
+        for _ in range(3):
+            self.bucket.record(throttled=True)
+        self.assertLess(self.bucket.refill_rate, 2.0)
+        self.assertGreaterEqual(self.bucket.refill_rate, self.bucket.min_refill_rate)
+        
+        for _ in range(100):
+            self.bucket.record(throttled=False)
+        self.assertEqual(self.bucket.refill_rate, 2.0)
+    
+    def test_parse_retry_after(self):
+        self.assertEqual(TokenBucket.parse_retry_after("2.5"), 2.5)
+        self.assertEqual(TokenBucket.parse_retry_after("-1"), 0.0)
+        self.assertIsNone(TokenBucket.parse_retry_after(None))
+        self.assertIsNone(TokenBucket.parse_retry_after("soon"))
+        self.assertEqual(TokenBucket.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+    
+    def test_parse_retry_after_rejects_non_finite(self):
+        self.assertIsNone(TokenBucket.parse_retry_after("inf"))
+        self.assertIsNone(TokenBucket.parse_retry_after("1e400"))
+        self.assertIsNone(TokenBucket.parse_retry_after("nan"))
+
+
+class RetryAfterTest(unittest.TestCase):
+    """A 429 answer pauses the shared bucket for Retry-After, then the request is retried."""
+    
+    def setUp(self):
+        self.client = make_client(self)
+        self.client.rate_limiter = mock.Mock(spec=TokenBucket)
+    
+    def test_retry_after_penalizes_bucket_and_retries(self):
+        responses = [FakeResponse(429, headers={"Retry-After": "1.5"}), FakeResponse(200)]
+        with mock.patch.object(self.client.session, "request", side_effect=responses) as request:
+            response = self.client._send_request("GET", "/v2/my/agent")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.call_count, 2)
+        self.client.rate_limiter.penalize.assert_called_once_with(1.5)
+        self.assertEqual(self.client.rate_limiter.record.call_args_list,
+                         [mock.call(True), mock.call(False)])
+    
+    def test_retry_after_is_capped(self):
+        responses = [FakeResponse(429, headers={"Retry-After": "86400"}), FakeResponse(200)]
+        with mock.patch.object(self.client.session, "request", side_effect=responses):
+            self.client._send_request("GET", "/v2/my/agent")
+        
+        self.client.rate_limiter.penalize.assert_called_once_with(MAX_RETRY_AFTER)
+    
+    def test_gives_up_after_max_retries(self):
+        self.client.max_rate_limit_retries = 2
+        responses = [FakeResponse(429, headers={"Retry-After": "0"}) for _ in range(3)]
+        with mock.patch.object(self.client.session, "request", side_effect=responses) as request:
+            response = self.client._send_request("GET", "/v2/my/agent")
+        
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(self.client.rate_limiter.penalize.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Tests for deriving a ship's navigation status from its route arrival time.
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from models.ship import ShipNav, ShipNavStatus
+from tests.helpers import route_arriving_in
+
+
+def _nav(status, arrival_in=None):
+    """Build a ShipNav from an API-shaped payload arriving `arrival_in` seconds from now."""
+    route = route_arriving_in(arrival_in) if arrival_in is not None else {}
+    return ShipNav.from_api_response({
+        'systemSymbol': 'X1-A',
+        'waypointSymbol': 'X1-A-B',
+        'route': route,
+        'status': status,
+    })
+
+
+class CurrentStatusTest(unittest.TestCase):
+    """All status accessors agree, before and after the arrival time, without mutating `status`."""
+    
+    def test_in_transit_before_arrival(self):
+        nav = _nav('IN_TRANSIT', arrival_in=60)
+        
+        self.assertEqual(nav.current_status, ShipNavStatus.IN_TRANSIT)
+        self.assertTrue(nav.is_in_transit)
+        self.assertFalse(nav.is_in_orbit)
+        self.assertFalse(nav.is_docked)
+    
+    def test_in_orbit_once_arrival_has_passed(self):
+        nav = _nav('IN_TRANSIT', arrival_in=60)
+        
+        with mock.patch('models.ship.time.time', return_value=time.time() + 120):
+            # Checked in an order that reads is_docked before anything else
+            self.assertFalse(nav.is_docked)
+            self.assertTrue(nav.is_in_orbit)
+            self.assertFalse(nav.is_in_transit)
+            self.assertEqual(nav.current_status, ShipNavStatus.IN_ORBIT)
+        
+        # The reported status is left as the API gave it
+        self.assertEqual(nav.status, ShipNavStatus.IN_TRANSIT)
+    
+    def test_stationary_statuses_are_unchanged(self):
+        self.assertTrue(_nav('DOCKED').is_docked)
+        self.assertTrue(_nav('IN_ORBIT').is_in_orbit)
+    
+    def test_in_transit_without_arrival_stays_in_transit(self):
+        self.assertTrue(_nav('IN_TRANSIT').is_in_transit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for the SQLite-backed response cache.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from api.cache import SqliteCache
+
+
+class SqliteCacheTest(unittest.TestCase):
+    """Entries persisted by one SqliteCache are loaded by the next one on the same file."""
+    
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+    
+    def _open(self, **kwargs):
+        cache = SqliteCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+    
+    def test_round_trip(self):
+        cache = self._open()
+        cache.set("GET /v2/systems/X1-A", {"data": {"symbol": "X1-A"}}, 60)
+        cache.close()
+        
+        self.assertEqual(self._open().get("GET /v2/systems/X1-A"), {"data": {"symbol": "X1-A"}})
+    
+    def test_expired_rows_are_pruned_on_open(self):
+        cache = self._open()
+        cache.set("GET /v2/systems/X1-A", {"data": {}}, 0.01)
+        cache.close()
+        time.sleep(0.02)
+        
+        reopened = self._open()
+        self.assertIsNone(reopened.get("GET /v2/systems/X1-A"))
+        rows = reopened._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertEqual(rows, 0)
+    
+    def test_persist_predicate_keeps_other_entries_in_memory(self):
+        cache = self._open(persist=lambda key: key.startswith("GET /v2/systems/"))
+        cache.set("GET /v2/systems/X1-A", {"data": 1}, 60)
+        cache.set("GET /v2/my/agent", {"data": 2}, 60)
+        self.assertEqual(cache.get("GET /v2/my/agent"), {"data": 2})
+        cache.close()
+        
+        reopened = self._open()
+        self.assertEqual(reopened.get("GET /v2/systems/X1-A"), {"data": 1})
+        self.assertIsNone(reopened.get("GET /v2/my/agent"))
+    
+    def test_remove_and_clear_are_written_through(self):
+        cache = self._open()
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.remove("a")
+        cache.close()
+        
+        reopened = self._open()
+        self.assertIsNone(reopened.get("a"))
+        self.assertEqual(reopened.get("b"), 2)
+        reopened.clear()
+        reopened.close()
+        
+        self.assertIsNone(self._open().get("b"))
+    
+    def test_tables_are_independent(self):
+        responses = self._open(table="responses")
+        etags = self._open(table="etags")
+        responses.set("k", "body", 60)
+        etags.set("k", ["etag", "body"], 60)
+        responses.close()
+        etags.close()
+        
+        self.assertEqual(self._open(table="responses").get("k"), "body")
+        self.assertEqual(self._open(table="etags").get("k"), ["etag", "body"])
+    
+    def test_jittered_expiry_matches_on_disk(self):
+        cache = self._open(jitter=0.25)
+        before = time.time()
+        cache.set("k", 1, 100)
+        
+        expires_at = cache._db.execute("SELECT expires_at FROM responses WHERE key = 'k'").fetchone()[0]
+        self.assertEqual(cache._entries["k"][0], expires_at)
+        self.assertGreaterEqual(expires_at, before + 100)
+        self.assertLessEqual(expires_at, time.time() + 125)
+
+
+if __name__ == "__main__":
+    unittest.main()
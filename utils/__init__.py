@@ -2,6 +2,6 @@
 Utility modules for SpaceTraders agent.
 """
 
-from .logging import setup_logging
+from .logging import setup_logging, stop_logging
 
-__all__ = ['setup_logging']
\ No newline at end of file
+__all__ = ['setup_logging', 'stop_logging']
\ No newline at end of file
@@ -3,14 +3,28 @@ Logging configuration utilities.
 """
 
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Optional
+from typing import Optional, Tuple
+
+# Log file rotation and write batching
+LOG_FILE_MAX_BYTES = 10_000_000
+LOG_FILE_BACKUPS = 3
+LOG_FILE_BUFFER_RECORDS = 1024
+
+# (level, log_file, queue handler, listener) installed by the last setup_logging call
+_active_setup: Optional[Tuple[int, Optional[str], logging.Handler, logging.handlers.QueueListener]] = None
 
 
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """
     Setup logging configuration.
     
+    The root logger only enqueues records; a background listener thread
+    formats them and does the console and file I/O. Call `stop_logging`
+    before exit to flush what is still queued.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional log file path
@@ -18,9 +32,20 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     Returns:
         Configured logger instance
     """
+    global _active_setup
+    
     # Convert string level to logging constant
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     
+    # Repeated calls with the same settings keep the handlers already installed
+    root_logger = logging.getLogger()
+    if _active_setup is not None:
+        active_level, active_file, active_queue_handler, _ = _active_setup
+        if (active_level, active_file) == (numeric_level, log_file) and \
+                active_queue_handler in root_logger.handlers:
+            return logging.getLogger('spacetraders_agent')
+        stop_logging()
+    
     # Create formatter
     formatter = logging.Formatter(
         fmt='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
@@ -28,7 +53,6 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     )
     
     # Setup root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
     
     # Clear any existing handlers
@@ -38,19 +62,53 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
-    # File handler if specified
+    # File handler if specified; records are buffered and written in batches,
+    # with anything at ERROR or above flushing the buffer immediately
     if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(numeric_level)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS
+        )
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        buffered_handler = logging.handlers.MemoryHandler(
+            LOG_FILE_BUFFER_RECORDS, flushLevel=logging.ERROR, target=file_handler
+        )
+        buffered_handler.setLevel(numeric_level)
+        handlers.append(buffered_handler)
+    
+    # Callers only pay for an enqueue; the listener thread owns the real handlers
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    
+    _active_setup = (numeric_level, log_file, queue_handler, listener)
     
     # Return logger for the main module
     return logging.getLogger('spacetraders_agent')
 
 
+def stop_logging() -> None:
+    """Stop the background listener, flushing queued records to the handlers."""
+    global _active_setup
+    
+    if _active_setup is None:
+        return
+    _, _, queue_handler, listener = _active_setup
+    _active_setup = None
+    
+    logging.getLogger().removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        # A buffering handler flushes into its target on close but leaves the target open
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the specified name."""
     return logging.getLogger(name)
\ No newline at end of file